@@ -0,0 +1,150 @@
+import os
+import sqlite3
+import threading
+
+from fuzzy_titles import FuzzyTitleResolver
+
+
+class AggregationStore:
+    """Persistent per-day game leaderboard
+
+    For every canonical title (grouped by title_key, whichever analyzer
+    found it) it keeps mentions and total likes per day, plus the title
+    variants and mentioning URIs. Adding posts only touches the rows
+    of the titles and days they mention, and adding a post twice is a
+    no-op (or just refreshes its like count), so new crawls update the
+    store in O(new posts). Leaderboards for any date range are sums over
+    the day buckets instead of a rescan of the posts.
+    """
+
+    def __init__(self, path="./data/aggregates.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS title_days ("
+            "key TEXT NOT NULL, day TEXT NOT NULL, mentions INTEGER NOT NULL DEFAULT 0, "
+            "total_likes INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (key, day))")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS title_days_day ON title_days(day)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS titles (key TEXT PRIMARY KEY, canonical TEXT)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS title_variants ("
+            "key TEXT NOT NULL, variant TEXT NOT NULL, PRIMARY KEY (key, variant))")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS title_uris ("
+            "key TEXT NOT NULL, uri TEXT NOT NULL, day TEXT NOT NULL, "
+            "likes INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (key, uri))")
+        self.conn.commit()
+
+    @staticmethod
+    def title_key(canonical):
+        """Group key of a canonical title, the same for every writer"""
+        return FuzzyTitleResolver.normalize(canonical)
+
+    @staticmethod
+    def day_of(created_at):
+        """'YYYY-MM-DD' bucket of an ISO timestamp"""
+        return created_at[:10] if isinstance(created_at, str) and len(created_at) >= 10 \
+            else 'unknown'
+
+    def _add(self, key, canonical, variant, uri, day, likes):
+        inserted = self.conn.execute(
+            "INSERT OR IGNORE INTO title_uris (key, uri, day, likes) VALUES (?, ?, ?, ?)",
+            (key, uri, day, likes)).rowcount
+        if inserted:
+            self.conn.execute(
+                "INSERT INTO title_days (key, day, mentions, total_likes) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT (key, day) DO UPDATE SET mentions = mentions + 1, "
+                "total_likes = total_likes + excluded.total_likes",
+                (key, day, likes))
+            self.conn.execute(
+                "INSERT OR IGNORE INTO titles (key, canonical) VALUES (?, ?)",
+                (key, canonical))
+            self.conn.execute(
+                "INSERT OR IGNORE INTO title_variants (key, variant) VALUES (?, ?)",
+                (key, variant))
+            return
+        # Seen before: only a changed like count needs applying
+        stored_day, stored_likes = self.conn.execute(
+            "SELECT day, likes FROM title_uris WHERE key = ? AND uri = ?",
+            (key, uri)).fetchone()
+        if stored_likes != likes:
+            self.conn.execute(
+                "UPDATE title_uris SET likes = ? WHERE key = ? AND uri = ?",
+                (likes, key, uri))
+            self.conn.execute(
+                "UPDATE title_days SET total_likes = total_likes + ? "
+                "WHERE key = ? AND day = ?",
+                (likes - stored_likes, key, stored_day))
+
+    def add_mentions(self, mentions):
+        """Apply (canonical, variant, uri, created_at, like_count) tuples"""
+        with self._lock:
+            for canonical, variant, uri, created_at, like_count in mentions:
+                key = self.title_key(canonical) if canonical else None
+                if key:
+                    self._add(key, canonical, variant, uri, self.day_of(created_at),
+                              int(like_count or 0))
+            self.conn.commit()
+
+    def add_results(self, df, analyzer):
+        """Add GameAnalyzer.extract_game_titles results by resolve_title canonical"""
+        resolved = {}
+        mentions = []
+        for title, uri, created_at, like_count in zip(
+                df['game_title'], df['uri'], df['created_at'], df['like_count']):
+            if not isinstance(title, str):
+                continue
+            if title not in resolved:
+                resolved[title] = analyzer.resolve_title(title)
+            _, canonical, _ = resolved[title]
+            mentions.append((canonical, title, uri, created_at, like_count))
+        self.add_mentions(mentions)
+
+    def top(self, n=20, start=None, end=None):
+        """Most mentioned titles over days in [start, end] ('YYYY-MM-DD', inclusive)
+
+        Returns dicts with key, canonical, mentions and total_likes.
+        """
+        conditions, params = [], []
+        if start:
+            conditions.append("d.day >= ?")
+            params.append(start)
+        if end:
+            conditions.append("d.day <= ?")
+            params.append(end)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ''
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT d.key, t.canonical, SUM(d.mentions) AS mentions, "
+                "SUM(d.total_likes) AS likes FROM title_days d "
+                f"LEFT JOIN titles t ON t.key = d.key {where}"
+                "GROUP BY d.key ORDER BY mentions DESC, likes DESC LIMIT ?",
+                (*params, n)).fetchall()
+        return [{'key': key, 'canonical': canonical, 'mentions': mentions,
+                 'total_likes': likes} for key, canonical, mentions, likes in rows]
+
+    def details(self, key, start=None, end=None):
+        """Variants and mentioning URIs of one title group"""
+        conditions, params = ["key = ?"], [key]
+        if start:
+            conditions.append("day >= ?")
+            params.append(start)
+        if end:
+            conditions.append("day <= ?")
+            params.append(end)
+        with self._lock:
+            variants = [row[0] for row in self.conn.execute(
+                "SELECT variant FROM title_variants WHERE key = ?", (key,))]
+            uris = [row[0] for row in self.conn.execute(
+                f"SELECT uri FROM title_uris WHERE {' AND '.join(conditions)} "
+                "ORDER BY day", params)]
+        return {'variants': set(variants), 'uris': uris}
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,239 @@
+import asyncio
+import functools
+import inspect
+import json
+import os
+import time
+from datetime import timedelta
+
+import requests
+
+from bsky_search import BskySearch
+from post_record import parse_search_page
+
+
+class AsyncBskyFetcher:
+    """Fetch searchPosts results for many date windows concurrently
+
+    Each window is paged through its cursors in its own task; at most
+    max_concurrency requests are in flight and every request start goes
+    through a shared TokenBucket. Pages are handed to the sink as they
+    arrive, as PostRecords parsed straight from the response bytes,
+    instead of being collected in memory.
+    """
+
+    def __init__(self, base_url="https://api.bsky.app", max_concurrency=4,
+                 rate_limiter=None, page_size=100, max_retries=5, timeout=30):
+        self.base_url = base_url
+        self.search_endpoint = "/xrpc/app.bsky.feed.searchPosts"
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter or BskySearch.rate_limiter
+        self.page_size = page_size
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.stats = {'requests': 0, 'retries': 0, 'pages': 0, 'posts': 0}
+
+    def login(self, handle, password, service="https://bsky.social"):
+        """Create a session and send searches through the user's PDS"""
+        response = self.session.post(
+            f"{service}/xrpc/com.atproto.server.createSession",
+            json={"identifier": handle, "password": password},
+            timeout=self.timeout
+        )
+        if response.status_code != 200:
+            raise Exception(
+                f"Login failed: {response.status_code}\n{response.text}")
+        self.base_url = service
+        self.session.headers['Authorization'] = f"Bearer {response.json()['accessJwt']}"
+
+    @staticmethod
+    def day_windows(start, days):
+        """(label, since, until) windows of one day each, starting at start"""
+        windows = []
+        for day in range(days):
+            current_date = start + timedelta(days=day)
+            next_date = current_date + timedelta(days=1)
+            windows.append((
+                current_date.strftime('%Y%m%d'),
+                BskySearch.convert_date_string(current_date.strftime('%Y-%m-%d')),
+                BskySearch.convert_date_string(next_date.strftime('%Y-%m-%d'))
+            ))
+        return windows
+
+    async def _get_page(self, params):
+        """GET one searchPosts page as (records, cursor), retrying on 429 and 5xx"""
+        for attempt in range(self.max_retries + 1):
+            async with self._semaphore:
+                # Tokens are taken inside the semaphore: a token taken
+                # while queued for a slot would be spent late, in a burst
+                await self.rate_limiter.acquire_async()
+                self.stats['requests'] += 1
+                response = await asyncio.to_thread(
+                    self.session.get,
+                    f"{self.base_url}{self.search_endpoint}",
+                    params=params,
+                    timeout=self.timeout
+                )
+            self.rate_limiter.update_from_headers(response.headers)
+            if response.status_code == 200:
+                return parse_search_page(response.content)
+            if not self.rate_limiter.is_retryable(response.status_code):
+                break
+            if attempt < self.max_retries:
+                self.stats['retries'] += 1
+                # backoff() pauses the shared bucket, so every window waits
+                self.rate_limiter.backoff(attempt, response.headers)
+
+        raise Exception(
+            f"Search failed: {response.status_code}\n{response.text}")
+
+    async def fetch_window(self, q, label, since, until, on_page, cursor=None,
+                           checkpoint=None, on_progress=None):
+        """Page through one window, passing each page to on_page
+
+        Starts from cursor when resuming. Posts indexed at or before
+        checkpoint were seen by an earlier run and are dropped. on_progress
+        is called with the next cursor and the page's posts after each page
+        has been handed over.
+        """
+        while True:
+            params = {"q": q, "since": since, "until": until,
+                      "limit": self.page_size}
+            if cursor:
+                params["cursor"] = cursor
+            records, cursor = await self._get_page(params)
+
+            posts = records
+            if checkpoint:
+                posts = [post for post in posts
+                         if (post.indexed_at or '') > checkpoint]
+            self.stats['pages'] += 1
+            self.stats['posts'] += len(posts)
+            result = on_page(label, posts)
+            if inspect.isawaitable(result):
+                await result
+
+            if on_progress:
+                on_progress(cursor, posts)
+            if not cursor or not records:
+                break
+
+    async def _fetch_tracked_window(self, hashtag, label, since, until, on_page,
+                                    cursor, checkpoint, state):
+        """fetch_window that checkpoints every page in the crawl state"""
+        def on_progress(next_cursor, posts):
+            state.save_progress(hashtag, label, since, until, next_cursor, posts)
+
+        await self.fetch_window(
+            f"#{hashtag}", label, since, until, on_page, cursor=cursor,
+            checkpoint=checkpoint, on_progress=on_progress)
+        state.mark_complete(hashtag, label, since, until)
+
+    async def crawl(self, hashtag, windows, on_page, state=None):
+        """Fetch every (label, since, until) window for #hashtag concurrently
+
+        max_concurrency workers take windows from a queue, so at most that
+        many windows (and pages waiting in on_page) are in flight however
+        long the date range is. With a CrawlStateStore, finished windows
+        are skipped, interrupted ones resume from their last cursor and
+        open ones only fetch posts newer than their checkpoint. Returns
+        {label: exception} for windows that failed; the other windows are
+        unaffected.
+        """
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        start = time.perf_counter()
+
+        if state is not None:
+            planned = state.plan(hashtag, windows)
+            print(f"{len(windows) - len(planned)} of {len(windows)} windows "
+                  f"already complete")
+            jobs = [
+                (label, functools.partial(
+                    self._fetch_tracked_window, hashtag, label, since, until, on_page,
+                    cursor, checkpoint, state))
+                for label, since, until, cursor, checkpoint in planned
+            ]
+        else:
+            jobs = [
+                (label, functools.partial(
+                    self.fetch_window, f"#{hashtag}", label, since, until, on_page))
+                for label, since, until in windows
+            ]
+
+        pending = asyncio.Queue()
+        for job in jobs:
+            pending.put_nowait(job)
+        failures = {}
+
+        async def worker():
+            while not pending.empty():
+                label, fetch = pending.get_nowait()
+                try:
+                    await fetch()
+                except asyncio.CancelledError:
+                    return  # on_page asked to stop
+                except Exception as e:
+                    failures[label] = e
+
+        await asyncio.gather(*(worker() for _ in range(min(self.max_concurrency, len(jobs)))))
+
+        self.stats['seconds'] = time.perf_counter() - start
+        print(f"Fetched {self.stats['posts']} posts in {self.stats['pages']} pages "
+              f"({self.stats['requests']} requests, {self.stats['retries']} retries) "
+              f"in {self.stats['seconds']:.1f}s")
+        for label, error in failures.items():
+            print(f"Window {label} failed: {str(error)}")
+        return failures
+
+
+class JsonlPageSink:
+    """Append each fetched page to posts_<hashtag>_<label>.jsonl
+
+    compression can be 'gz' or 'zst' to write .jsonl.gz/.jsonl.zst files.
+    With the crawl's CrawlStateStore, a window resumed from a cursor or
+    checkpoint adds to the file of the earlier run, and a window fetched
+    from the start replaces it, so no post is written twice.
+    """
+
+    def __init__(self, data_manager, hashtag, append=False, compression=None, state=None):
+        self.data_manager = data_manager
+        self.hashtag = hashtag
+        self.append = append  # always keep earlier runs' pages
+        self.compression = compression
+        self.state = state  # CrawlStateStore passed to crawl()
+        self._started = set()
+        self._written = {}  # {label: URIs already in a resumed window's file}
+
+    def filename(self, label):
+        suffix = f".{self.compression}" if self.compression else ''
+        return f"posts_{self.hashtag}_{label}.jsonl{suffix}"
+
+    def _existing_uris(self, label):
+        path = f"{self.data_manager.base_path}/{self.filename(label)}"
+        if not os.path.exists(path):
+            return set()
+        with self.data_manager.open_text(path) as f:
+            return {json.loads(line)['uri'] for line in f if line.strip()}
+
+    def __call__(self, label, posts):
+        # The first page of a window replaces any file from an earlier run,
+        # unless it continues that run. The state still describes the
+        # earlier run here: progress is only saved after this page
+        if label in self._started or self.append:
+            mode = 'a'
+        elif self.state is not None and self.state.continues(self.hashtag, label):
+            # A run stopped between writing a page and saving its cursor
+            # left that page in the file; it is fetched again now
+            mode = 'a'
+            self._written[label] = self._existing_uris(label)
+        else:
+            mode = 'w'
+        self._started.add(label)
+        written = self._written.get(label)
+        if written:
+            posts = [post for post in posts if post.uri not in written]
+        self.data_manager.append_jsonl(
+            (post.to_dict() for post in posts),
+            self.filename(label), mode=mode)
+
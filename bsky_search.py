@@ -4,14 +4,19 @@ from datetime import datetime, timedelta
 from dateutil.parser import parse
 import json
 import pytz
-import time
+from rate_limiter import TokenBucket
 
 
 class BskySearch:
-    def __init__(self):
+    # One limiter for every caller in the process, raw requests and atproto
+    rate_limiter = TokenBucket(rate=5.0)
+
+    def __init__(self, rate_limiter=None, max_retries=5):
         self.base_url = "https://api.bsky.app"
         self.search_endpoint = "/xrpc/app.bsky.feed.searchPosts"
-        self.delay = 15  # seconds between calls
+        if rate_limiter is not None:
+            self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
 
     def search_posts(self, q, since, until, limit=5):
         params = {
@@ -21,13 +26,19 @@ class BskySearch:
             "limit": limit
         }
 
-        print(f"\nWaiting {self.delay}s before API call...")
-        time.sleep(self.delay)
-
-        search_response = requests.get(
-            f"{self.base_url}{self.search_endpoint}",
-            params=params
-        )
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            search_response = requests.get(
+                f"{self.base_url}{self.search_endpoint}",
+                params=params
+            )
+            self.rate_limiter.update_from_headers(search_response.headers)
+            if (attempt == self.max_retries
+                    or not self.rate_limiter.is_retryable(search_response.status_code)):
+                break
+            delay = self.rate_limiter.backoff(attempt, search_response.headers)
+            print(f"\nSearch returned {search_response.status_code}, "
+                  f"retrying in {delay:.1f}s...")
 
         if search_response.status_code == 200:
             try:
@@ -52,15 +63,18 @@ class BskySearch:
             print(f"Likes: {post['like_count']}")
 
     @staticmethod
-    def get_posts_with_hashtag(client, hashtag, since='yesterday', until='today'):
+    def get_posts_with_hashtag(client, hashtag, since='yesterday', until='today',
+                               rate_limiter=None):
         cursor = None
         posts = []
+        rate_limiter = rate_limiter or BskySearch.rate_limiter
 
         since_iso = BskySearch.convert_date_string(since)
         until_iso = BskySearch.convert_date_string(until)
 
         while True:
-            fetched = client.app.bsky.feed.search_posts(
+            fetched = rate_limiter.call(
+                client.app.bsky.feed.search_posts,
                 params={
                     "q": f"#{hashtag}",
                     "cursor": cursor,
@@ -68,7 +82,7 @@ class BskySearch:
                     "until": until_iso
                 }
             )
-            posts = posts + fetched.posts
+            posts.extend(fetched.posts)
 
             if not fetched.cursor:
                 break
@@ -0,0 +1,138 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+
+class CrawlStateStore:
+    """SQLite record of crawl progress per (hashtag, window)
+
+    For every window it keeps the last page cursor, the newest indexedAt
+    seen and whether it finished. Windows whose end is in the past are
+    closed once finished and never fetched again; windows still open (the
+    current day) are refreshed from their newest indexedAt on the next run.
+    """
+
+    def __init__(self, path="./data/crawl_state.sqlite"):
+        self.path = path
+        # Crawls may run in another thread than the one that opened the store
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS windows ("
+            "hashtag TEXT NOT NULL, label TEXT NOT NULL, "
+            "since TEXT, until TEXT, "
+            "status TEXT NOT NULL DEFAULT 'pending', "  # pending, open or closed
+            "cursor TEXT, newest_indexed_at TEXT, posts INTEGER DEFAULT 0, "
+            "updated_at TEXT, PRIMARY KEY (hashtag, label))")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cursors ("
+            "name TEXT PRIMARY KEY, cursor TEXT, updated_at TEXT)")
+        self.conn.commit()
+
+    @staticmethod
+    def _now():
+        return datetime.now(timezone.utc).isoformat()
+
+    def get(self, hashtag, label):
+        """Stored state of one window as a dict, or None"""
+        with self._lock:
+            self.conn.row_factory = sqlite3.Row
+            row = self.conn.execute(
+                "SELECT * FROM windows WHERE hashtag = ? AND label = ?",
+                (hashtag, label)).fetchone()
+            self.conn.row_factory = None
+        return dict(row) if row else None
+
+    def plan(self, hashtag, windows):
+        """Windows still to fetch as (label, since, until, cursor, checkpoint)
+
+        Closed windows are skipped. An interrupted window resumes from its
+        cursor with the query it was issued for; a finished open window is
+        refetched from its checkpoint (the newest indexedAt seen), so only
+        newer posts are requested.
+        """
+        planned = []
+        for label, since, until in windows:
+            state = self.get(hashtag, label)
+            if state is None:
+                planned.append((label, since, until, None, None))
+            elif state['status'] == 'closed':
+                continue
+            elif state['cursor']:
+                planned.append((label, state['since'], until, state['cursor'], None))
+            elif state['status'] == 'open' and state['newest_indexed_at']:
+                checkpoint = state['newest_indexed_at']
+                planned.append((label, checkpoint, until, None, checkpoint))
+            else:
+                planned.append((label, since, until, None, None))
+        return planned
+
+    def continues(self, hashtag, label):
+        """Whether plan() resumes the window from a cursor or checkpoint
+
+        False when it is fetched from the start, so whatever an earlier
+        run kept of it should be replaced rather than added to.
+        """
+        state = self.get(hashtag, label)
+        return bool(state) and bool(
+            state['cursor']
+            or (state['status'] == 'open' and state['newest_indexed_at']))
+
+    def _upsert(self, hashtag, label, since, until, **fields):
+        columns = ', '.join(fields)
+        updates = ', '.join(f"{name} = excluded.{name}" for name in fields)
+        with self._lock:
+            self.conn.execute(
+                f"INSERT INTO windows (hashtag, label, since, until, {columns}) "
+                f"VALUES (?, ?, ?, ?, {', '.join('?' * len(fields))}) "
+                f"ON CONFLICT (hashtag, label) DO UPDATE SET since = excluded.since, "
+                f"until = excluded.until, {updates}",
+                (hashtag, label, since, until, *fields.values()))
+            self.conn.commit()
+
+    def save_progress(self, hashtag, label, since, until, cursor, posts):
+        """Record a fetched page: the query, its next cursor and post count
+
+        posts are the page's PostRecords.
+        """
+        state = self.get(hashtag, label) or {}
+        newest = max(
+            [post.indexed_at or '' for post in posts]
+            + [state.get('newest_indexed_at') or ''])
+        self._upsert(
+            hashtag, label, since, until,
+            status=state.get('status', 'pending'),
+            cursor=cursor,
+            newest_indexed_at=newest or None,
+            posts=(state.get('posts') or 0) + len(posts),
+            updated_at=self._now())
+
+    def mark_complete(self, hashtag, label, since, until):
+        """Finish a window: closed if its end has passed, open otherwise"""
+        self._upsert(
+            hashtag, label, since, until,
+            status='closed' if until <= self._now() else 'open',
+            cursor=None,
+            updated_at=self._now())
+
+    def get_cursor(self, name):
+        """Last saved stream cursor (e.g. a firehose seq), or None"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT cursor FROM cursors WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def save_cursor(self, name, cursor):
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO cursors (name, cursor, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET cursor = excluded.cursor, "
+                "updated_at = excluded.updated_at",
+                (name, str(cursor), self._now()))
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
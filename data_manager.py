@@ -1,17 +1,70 @@
 import json
 import csv
+import gzip
+import io
 import pandas as pd
 from datetime import datetime
 import glob
 import os
+import textwrap
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import asdict
 from pprint import PrettyPrinter
 
+try:
+    import orjson
+except ImportError:  # optional, json is used instead
+    orjson = None
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _read_posts(path):
+    """Simplified posts of one .json or .jsonl[.gz|.zst] file as dicts"""
+    if DataManager.is_jsonl(path):
+        with DataManager.open_text(path) as f:
+            return [_loads(line) for line in f if line.strip()]
+    with open(path, 'rb') as f:
+        data = _loads(f.read())
+    return data['posts'] if isinstance(data, dict) and 'posts' in data else data
+
+
+def _parse_post_file(path):
+    """Parse one posts file into column lists, return (columns, rows, seconds)
+
+    Runs in a worker process of DataManager.load_to_pandas. JSON files
+    become {column: [values]} so the parent builds a single DataFrame;
+    CSV files are returned as a DataFrame.
+    """
+    start = time.perf_counter()
+    if path.endswith('.csv'):
+        df = pd.read_csv(path)
+        return df, len(df), time.perf_counter() - start
+
+    posts = _read_posts(path)
+    columns = {}
+    for i, post in enumerate(posts):
+        for key, value in post.items():
+            column = columns.get(key)
+            if column is None:
+                # Column first seen on this row: earlier rows lacked it
+                column = columns[key] = [None] * i
+            column.append(value)
+        for column in columns.values():
+            if len(column) <= i:
+                column.append(None)
+    return columns, len(posts), time.perf_counter() - start
+
 
 class DataManager:
-    def __init__(self, base_path="./data"):
+    def __init__(self, base_path="./data", post_store=None):
         self.base_path = base_path
         self.pp = PrettyPrinter(indent=2)
+        self.post_store = post_store  # PostStore also receiving saved posts
+        self.store_stats = {'inserted': 0, 'updated': 0}
 
     def bup_save_raw_json(self, data, filename=None):
         """Save selected fields from PostView objects"""
@@ -39,48 +92,157 @@ class DataManager:
         with open(f"{self.base_path}/{filename}", 'w') as f:
             json.dump({'posts': simplified_posts}, f, indent=4)
 
+    @staticmethod
+    def simplify_post(post):
+        """Select the fields we keep from a PostView object"""
+        # Extract tags from facets array
+        tags = []
+        if post.record.facets:
+            for facet in post.record.facets:
+                for feature in facet.features:
+                    if hasattr(feature, 'tag'):
+                        tags.append(feature.tag)
+
+        # Extract image alts
+        image_alts = []
+        if hasattr(post, 'embed') and hasattr(post.embed, 'media'):
+            if hasattr(post.embed.media, 'images'):
+                image_alts = [
+                    img.alt for img in post.embed.media.images]
+
+        return {
+            'uri': post.uri,
+            'handle': post.author.handle,
+            'created_at': post.record.created_at,
+            'text': post.record.text,
+            'tags': tags,
+            'like_count': getattr(post, 'like_count', 0),
+            'image_alts': image_alts
+        }
+
+    def _iter_simplified(self, posts):
+        for i, post in enumerate(posts):
+            try:
+                yield self.simplify_post(post)
+            except Exception as e:
+                print(f"\nError processing post {i}: {str(e)}")
+                continue
+
+    def _through_store(self, posts, batch_size=500):
+        """Pass posts through, upserting them into post_store in batches"""
+        if self.post_store is None:
+            yield from posts
+            return
+        batch = []
+        for post in posts:
+            batch.append(post)
+            yield post
+            if len(batch) == batch_size:
+                self._upsert(batch)
+                batch = []
+        if batch:
+            self._upsert(batch)
+
+    def _upsert(self, batch):
+        inserted, updated = self.post_store.upsert(batch)
+        self.store_stats['inserted'] += inserted
+        self.store_stats['updated'] += updated
+
     def save_raw_json(self, data, filename=None):
-        """Save selected fields from PostView objects"""
+        """Save selected fields from PostView objects
+
+        Posts are written one at a time as they are simplified. A .jsonl
+        filename (optionally .jsonl.gz or .jsonl.zst) writes one post per
+        line; otherwise the usual {'posts': [...]} document is produced.
+        """
         if not filename:
             filename = f"posts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
 
         posts = data['posts'] if isinstance(data, dict) else data
-        simplified_posts = []
 
-        for i, post in enumerate(posts):
+        if self.is_jsonl(filename):
+            self.append_jsonl(self._iter_simplified(posts), filename, mode='w')
+            return
+
+        # Same layout as json.dump({'posts': [...]}, f, indent=4)
+        with open(f"{self.base_path}/{filename}", 'w') as f:
+            f.write('{\n    "posts": [')
+            first = True
+            for simplified_post in self._through_store(self._iter_simplified(posts)):
+                f.write('\n' if first else ',\n')
+                f.write(textwrap.indent(json.dumps(simplified_post, indent=4), ' ' * 8))
+                first = False
+            f.write(']\n}' if first else '\n    ]\n}')
+
+    @staticmethod
+    def is_jsonl(filename):
+        return filename.endswith(('.jsonl', '.jsonl.gz', '.jsonl.zst'))
+
+    @staticmethod
+    def open_text(path, mode='r'):
+        """Open a text file, compressed according to its .gz/.zst suffix
+
+        Reading a .gz/.zst file goes through every member/frame in it, as
+        left by appending to it.
+        """
+        if path.endswith('.gz'):
+            return gzip.open(path, mode + 't', encoding='utf-8')
+        if path.endswith('.zst'):
             try:
-                # Extract tags from facets array
-                tags = []
-                if post.record.facets:
-                    for facet in post.record.facets:
-                        for feature in facet.features:
-                            if hasattr(feature, 'tag'):
-                                tags.append(feature.tag)
-
-                # Extract image alts
-                image_alts = []
-                if hasattr(post, 'embed') and hasattr(post.embed, 'media'):
-                    if hasattr(post.embed.media, 'images'):
-                        image_alts = [
-                            img.alt for img in post.embed.media.images]
-
-                simplified_post = {
-                    'uri': post.uri,
-                    'handle': post.author.handle,
-                    'created_at': post.record.created_at,
-                    'text': post.record.text,
-                    'tags': tags,
-                    'like_count': getattr(post, 'like_count', 0),
-                    'image_alts': image_alts
-                }
-                simplified_posts.append(simplified_post)
+                import zstandard
+            except ImportError:
+                raise ImportError(
+                    "zstandard is required for .zst files: pip install zstandard")
+            if mode != 'r':
+                return zstandard.open(path, mode + 't', encoding='utf-8')
+            # Without read_across_frames, zstandard may stop at the end of
+            # the first frame
+            reader = zstandard.ZstdDecompressor().stream_reader(
+                open(path, 'rb'), read_across_frames=True, closefd=True)
+            return io.TextIOWrapper(reader, encoding='utf-8')
+        return open(path, mode, encoding='utf-8')
 
-            except Exception as e:
-                print(f"\nError processing post {i}: {str(e)}")
+    def append_jsonl(self, posts, filename, mode='a'):
+        """Write simplified posts as one JSON object per line
+
+        Appending to .gz/.zst files adds a new compressed member/frame,
+        which open_text() reads through. With a post_store the posts are
+        upserted into it as well.
+        """
+        with self.open_text(f"{self.base_path}/{filename}", mode) as f:
+            for post in self._through_store(posts):
+                f.write(json.dumps(post, ensure_ascii=False))
+                f.write('\n')
+
+    def iter_jsonl_chunks(self, pattern='posts_*.jsonl*', chunksize=10000):
+        """Yield DataFrames of at most chunksize posts from matching files
+
+        Only one chunk of parsed posts is held in memory at a time.
+        """
+        files = sorted(glob.glob(f"{self.base_path}/{pattern}"))
+        if not files:
+            raise FileNotFoundError(
+                f"No files found matching pattern: {pattern}")
+
+        for file in files:
+            if not self.is_jsonl(file):
                 continue
+            batch = []
+            with self.open_text(file) as f:
+                for line in f:
+                    if line.strip():
+                        batch.append(json.loads(line))
+                    if len(batch) == chunksize:
+                        yield self._chunk_frame(batch, file)
+                        batch = []
+            if batch:
+                yield self._chunk_frame(batch, file)
 
-        with open(f"{self.base_path}/{filename}", 'w') as f:
-            json.dump({'posts': simplified_posts}, f, indent=4)
+    @staticmethod
+    def _chunk_frame(batch, file):
+        df = pd.DataFrame.from_records(batch)
+        df['source_file'] = os.path.basename(file)
+        return df
 
     def save_as_csv(self, posts, filename=None):
         """Extract relevant fields to CSV"""
@@ -105,30 +267,95 @@ class DataManager:
             writer.writeheader()
             writer.writerows(rows)
 
-    def load_to_pandas(self, pattern='posts_*.csv'):
+    def load_to_pandas(self, pattern='posts_*.csv', max_workers=1):
         """
         Load multiple files into pandas DataFrame
         pattern: file pattern to match (e.g., 'posts_*.csv', 'posts_202501*.json')
+        max_workers: processes parsing files in parallel (default 1: parse in
+        this process; None: all cores). With more than one, the calling
+        script needs an `if __name__ == '__main__':` guard on macOS/Windows,
+        where worker processes re-import it.
         """
-        files = glob.glob(f"{self.base_path}/{pattern}")
+        files = sorted(glob.glob(f"{self.base_path}/{pattern}"))
+        files = [file for file in files
+                 if self.is_jsonl(file) or file.endswith(('.json', '.csv'))]
 
         if not files:
             raise FileNotFoundError(
                 f"No files found matching pattern: {pattern}")
 
-        dfs = []
-        for file in files:
-            if file.endswith('.json'):
-                df = pd.read_json(file)
-                if 'posts' in df.columns:  # Handle nested JSON
-                    df = pd.json_normalize(df['posts'])
-            elif file.endswith('.csv'):
-                df = pd.read_csv(file)
+        start = time.perf_counter()
+        max_workers = min(max_workers or os.cpu_count() or 1, len(files))
+        if max_workers > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                parsed = list(executor.map(_parse_post_file, files))
+        else:
+            parsed = [_parse_post_file(file) for file in files]
+
+        # Merge the JSON column lists and build one DataFrame from them
+        columns = {}
+        source_files = []
+        frames = []
+        total_rows = 0
+        self.load_timings = []
+        for file, (result, rows, seconds) in zip(files, parsed):
+            self.load_timings.append((os.path.basename(file), rows, seconds))
+            if isinstance(result, pd.DataFrame):
+                result['source_file'] = os.path.basename(file)  # Track source file
+                frames.append(result)
+                continue
+            for key in result:
+                if key not in columns:
+                    # Column first seen in this file, in file order
+                    columns[key] = [None] * total_rows
+            for key, column in columns.items():
+                column.extend(result.get(key, [None] * rows))
+            source_files.extend([os.path.basename(file)] * rows)
+            total_rows += rows
+
+        if source_files:
+            columns['source_file'] = source_files
+            frames.insert(0, pd.DataFrame(columns))
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+        slowest = max(self.load_timings, key=lambda timing: timing[2])
+        print(f"Loaded {len(df)} rows from {len(files)} files with {max_workers} "
+              f"workers in {time.perf_counter() - start:.2f}s "
+              f"(slowest: {slowest[0]}, {slowest[1]} rows, {slowest[2]:.2f}s)")
+        return df
+
+    def post_files(self, pattern):
+        """Sorted .json/.jsonl files in base_path matching pattern"""
+        files = sorted(glob.glob(f"{self.base_path}/{pattern}"))
+        files = [file for file in files if self.is_jsonl(file) or file.endswith('.json')]
+        if not files:
+            raise FileNotFoundError(
+                f"No files found matching pattern: {pattern}")
+        return files
+
+    @staticmethod
+    def read_posts(path):
+        """Simplified post dicts of one .json or .jsonl[.gz|.zst] file"""
+        return _read_posts(path)
+
+    def iter_posts(self, pattern='posts_*.json*'):
+        """Yield simplified post dicts from .json/.jsonl files, one file at a time
 
-            df['source_file'] = os.path.basename(file)  # Track source file
-            dfs.append(df)
+        e.g. PostTable.from_posts(dm.iter_posts('posts_2024*.jsonl'))
+        """
+        for file in self.post_files(pattern):
+            yield from _read_posts(file)
 
-        return pd.concat(dfs, ignore_index=True)
+    def load_into_store(self, pattern='posts_*.json*'):
+        """Upsert the posts of existing .json/.jsonl files into post_store"""
+        files = self.post_files(pattern)
+        before = dict(self.store_stats)
+        for file in files:
+            for _ in self._through_store(_read_posts(file)):
+                pass
+        print(f"Stored {len(files)} files: "
+              f"{self.store_stats['inserted'] - before['inserted']} new posts, "
+              f"{self.store_stats['updated'] - before['updated']} like counts updated")
 
     def _convert_to_dict(self, obj):
         """Convert object to JSON serializable dict"""
@@ -1,5 +1,7 @@
 from game_analyzer import GameAnalyzer
+from game_analyzer_text import GameAnalyzerText
 from data_manager import DataManager
+from llm_cache import LLMCache
 
 
 def show_df_info(df):
@@ -21,9 +23,11 @@ def show_df_info(df):
 
 
 # Initialize and test
-analyzer = GameAnalyzer()
+text_analyzer = GameAnalyzerText()
+analyzer = GameAnalyzer(cache=LLMCache(), fast_path=text_analyzer,
+                        title_resolver=text_analyzer.title_resolver, stream=True)
 dm = DataManager()
-df = dm.load_to_pandas('posts_gamechallenge_20241201.json')
+df = dm.load_to_pandas('posts_gamechallenge_20241201.json*')
 # show_df_info(df)
 
 
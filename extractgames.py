@@ -0,0 +1,9 @@
+from data_manager import DataManager
+from game_analyzer_text import GameAnalyzerText
+from post_table import PostTable
+
+# Every daily file get_bsky_posts.py wrote (.jsonl, or .json from older crawls)
+analyzer = GameAnalyzerText()
+posts = PostTable.from_posts(DataManager().iter_posts('posts_gamechallenge_*.json*'))
+results = analyzer.analyze_posts(posts)
+analyzer.print_analysis(results)
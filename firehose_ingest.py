@@ -0,0 +1,184 @@
+import asyncio
+import gzip
+import pickle
+import re
+import time
+
+from atproto import CAR, AsyncFirehoseSubscribeReposClient, models
+
+
+class FirehoseIngestor:
+    """Stream #hashtag posts from the Bluesky firehose into a PostStore
+
+    Most commits are unrelated, so each frame's raw CAR bytes are first
+    searched for the hashtag (case-insensitive) and only the few that
+    contain it are parsed, decoded and checked for a matching tag facet.
+    Matches are upserted in micro-batches; after each batch the firehose
+    seq is saved in the CrawlStateStore so a restart resumes from there.
+
+    The firehose carries DIDs, not handles, so posts are stored without a
+    handle; the author's DID is the first part of the post's AT URI.
+    """
+
+    def __init__(self, post_store, state=None, hashtag="gamechallenge",
+                 batch_size=50, flush_interval=2.0, cursor_name="firehose"):
+        self.post_store = post_store
+        self.state = state  # CrawlStateStore keeping the resume cursor
+        self.hashtag = hashtag.lower()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval  # seconds between flushes
+        self.cursor_name = cursor_name
+        self.prefilter = re.compile(re.escape(hashtag).encode('utf-8'), re.IGNORECASE)
+        self.client = None
+        self.last_seq = None
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self.stats = {'frames': 0, 'candidates': 0, 'matched': 0, 'stored': 0}
+
+    def record_to_post(self, repo, path, record):
+        """Simplified post dict from a raw app.bsky.feed.post record"""
+        tags = []
+        for facet in record.get('facets') or []:
+            for feature in facet.get('features', []):
+                if 'tag' in feature:
+                    tags.append(feature['tag'])
+
+        embed = record.get('embed') or {}
+        images = embed.get('images') or (embed.get('media') or {}).get('images') or []
+
+        return {
+            'uri': f"at://{repo}/{path}",
+            'handle': None,  # only the DID is known, and it is in the uri
+            'created_at': record.get('createdAt'),
+            'text': record.get('text', ''),
+            'tags': tags,
+            'like_count': 0,
+            'image_alts': [img.get('alt', '') for img in images]
+        }
+
+    def _matching_posts(self, body):
+        """Decode a candidate commit, return the posts tagged with the hashtag"""
+        commit = models.get_or_create(
+            body, models.ComAtprotoSyncSubscribeRepos.Commit, strict=False)
+        car = CAR.from_bytes(commit.blocks)
+        posts = []
+        for op in commit.ops:
+            if op.action != 'create' or not op.cid \
+                    or not op.path.startswith('app.bsky.feed.post/'):
+                continue
+            record = car.blocks.get(op.cid)
+            if not record:
+                continue
+            post = self.record_to_post(commit.repo, op.path, record)
+            tags = post['tags'] + list(record.get('tags') or [])
+            if any(tag.lower() == self.hashtag for tag in tags):
+                posts.append(post)
+        return posts
+
+    def collect_frame(self, frame_type, body):
+        """Queue the matching posts of one message, return whether to flush"""
+        self.stats['frames'] += 1
+        if isinstance(body, dict) and body.get('seq') is not None:
+            self.last_seq = body['seq']
+
+        if frame_type == '#commit':
+            blocks = body.get('blocks')
+            if blocks and self.prefilter.search(blocks):
+                self.stats['candidates'] += 1
+                try:
+                    posts = self._matching_posts(body)
+                except Exception as e:
+                    print(f"Error decoding commit {body.get('seq')}: {str(e)}")
+                    posts = []
+                self.stats['matched'] += len(posts)
+                self._pending.extend(posts)
+
+        return len(self._pending) >= self.batch_size \
+            or time.monotonic() - self._last_flush >= self.flush_interval
+
+    def handle_frame(self, frame_type, body):
+        """Process one firehose message (its header type and decoded body)"""
+        if self.collect_frame(frame_type, body):
+            self.flush()
+
+    def flush(self):
+        """Upsert pending posts, then save the cursor they were read up to"""
+        # Taken first, so frames handled meanwhile wait for the next flush
+        pending, self._pending = self._pending, []
+        seq = self.last_seq
+        self._last_flush = time.monotonic()
+        if pending:
+            inserted, _ = self.post_store.upsert(pending)
+            self.stats['stored'] += inserted
+        if seq is not None:
+            if self.state is not None:
+                self.state.save_cursor(self.cursor_name, seq)
+            if self.client is not None:
+                self.client.update_params(
+                    models.ComAtprotoSyncSubscribeRepos.Params(cursor=seq))
+
+    async def run(self, recorder=None):
+        """Consume the live firehose until cancelled, resuming from the cursor
+
+        With a FirehoseCapture recorder every frame is also written to disk
+        for later replays.
+        """
+        cursor = self.state.get_cursor(self.cursor_name) if self.state else None
+        params = None
+        if cursor:
+            print(f"Resuming firehose from seq {cursor}")
+            params = models.ComAtprotoSyncSubscribeRepos.Params(cursor=int(cursor))
+        self.client = AsyncFirehoseSubscribeReposClient(params)
+
+        async def on_message_handler(message):
+            if recorder is not None:
+                recorder.write(message.type, message.body)
+            if self.collect_frame(message.type, message.body):
+                # SQLite writes run in a thread, off the event loop
+                await asyncio.to_thread(self.flush)
+
+        try:
+            await self.client.start(on_message_handler)
+        finally:
+            self.flush()
+
+    def replay(self, path):
+        """Run a recorded capture through the pipeline, return frames per second"""
+        frames = list(FirehoseCapture.read(path))
+        start = time.perf_counter()
+        for frame_type, body in frames:
+            self.handle_frame(frame_type, body)
+        self.flush()
+        seconds = time.perf_counter() - start
+        rate = len(frames) / seconds if seconds else 0.0
+        print(f"Replayed {len(frames)} frames in {seconds:.2f}s ({rate:.0f} frames/s): "
+              f"{self.stats['candidates']} candidates, {self.stats['matched']} matched")
+        return rate
+
+
+class FirehoseCapture:
+    """Gzipped stream of pickled (frame type, body) firehose messages
+
+    Only replay captures you recorded yourself: loading runs pickle.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.frames = 0
+        self._file = gzip.open(path, 'wb')
+
+    def write(self, frame_type, body):
+        pickle.dump((frame_type, body), self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.frames += 1
+
+    def close(self):
+        self._file.close()
+
+    @staticmethod
+    def read(path):
+        with gzip.open(path, 'rb') as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
@@ -0,0 +1,204 @@
+import re
+from array import array
+from collections import Counter
+from operator import itemgetter
+
+
+class FuzzyTitleResolver:
+    """Map raw title strings to the closest known game title
+
+    Titles are indexed by character trigrams in an inverted index. A lookup
+    only reads the postings of the query's rarest trigrams (a title within
+    a couple of typos of the query shares at least one of them), ranks
+    those candidates by how much of the query's trigrams they contain and
+    rescores the best few by Damerau edit distance (a swap of two letters
+    is one edit). The confidence is 1 - distance / length, so 1.0 means the
+    same title after normalization.
+
+    Queries may also name just a subtitle ("Ocarina of Time"), optionally
+    with words of the series ("Zelda: Ocarina of Time"), or abbreviate the
+    subtitle to its initials ("Zelda OOT"); such matches score a little
+    below a full-title match.
+    """
+
+    VERSION = 1  # bump when the index layout changes (invalidates caches)
+    SEPARATORS = re.compile(r'\s*:\s*|\s+[-\u2013\u2014]\s+')
+    SUBTITLE_WEIGHT = 0.95  # a full-title match beats the same subtitle match
+    ACRONYM_SCORE = 0.9  # subtitle given as its initials, series words all found
+
+    def __init__(self, titles, prefix_grams=7, posting_budget=3000,
+                 candidates=30, rescored=5):
+        self.prefix_grams = prefix_grams  # rarest query trigrams read
+        self.posting_budget = posting_budget  # postings read past the third
+        self.candidates = candidates  # candidates ranked by Dice
+        self.rescored = rescored  # candidates rescored by edit distance
+        self.titles = []
+        self._keys = []
+        self._gram_counts = array('H')
+        self._exact = {}
+        self._postings = {}
+        self._subtitles = {}  # title id -> (series words, [(subtitle, initials)])
+        self._acronyms = {}  # subtitle initials -> title ids
+
+        for title in titles:
+            key = self.normalize(title)
+            if not key or key in self._exact:
+                continue
+            title_id = len(self.titles)
+            self.titles.append(title)
+            self._keys.append(key)
+            self._exact[key] = title_id
+            title_grams = self.trigrams(key)
+            self._gram_counts.append(min(len(title_grams), 0xFFFF))
+            for gram in title_grams:
+                postings = self._postings.get(gram)
+                if postings is None:
+                    postings = self._postings[gram] = array('i')
+                postings.append(title_id)
+            self._index_subtitles(title_id, title)
+
+    def _index_subtitles(self, title_id, title):
+        segments = [self.normalize(segment) for segment in self.SEPARATORS.split(title)]
+        segments = [segment for segment in segments if segment]
+        if len(segments) < 2:
+            return
+        subtitles = []
+        for segment in segments[1:]:
+            words = segment.split()
+            initials = ''.join(word[0] for word in words) if len(words) >= 2 else None
+            subtitles.append((segment, initials))
+            if initials:
+                acronym = self._acronyms.get(initials)
+                if acronym is None:
+                    acronym = self._acronyms[initials] = array('i')
+                acronym.append(title_id)
+        self._subtitles[title_id] = (frozenset(segments[0].split()), subtitles)
+
+    @staticmethod
+    def normalize(title):
+        """Lowercase, turn punctuation into spaces and collapse whitespace"""
+        return ' '.join(re.sub(r'[^\w]+', ' ', title.lower()).split())
+
+    @staticmethod
+    def trigrams(key):
+        padded = f"  {key} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def resolve(self, raw_title, min_confidence=0.0):
+        """Return (canonical title, confidence), or (None, 0.0) if no match"""
+        if not raw_title or raw_title.lower() == 'none':
+            return None, 0.0
+        key = self.normalize(raw_title)
+        if key in self._exact:
+            return self.titles[self._exact[key]], 1.0
+
+        grams = self.trigrams(key)
+        postings = sorted(
+            (self._postings[gram] for gram in grams if gram in self._postings),
+            key=len)
+        counts = Counter()
+        read = 0
+        for i, posting in enumerate(postings[:self.prefix_grams]):
+            if i >= 3 and read + len(posting) > self.posting_budget:
+                break
+            counts.update(posting)
+            read += len(posting)
+
+        ranked = []
+        best_counts = sorted(counts.items(), key=itemgetter(1), reverse=True)
+        for title_id, _ in best_counts[:self.candidates]:
+            # A trigram is shared iff it occurs in the padded title. Ranking
+            # by containment keeps long titles whose subtitle is the query
+            padded = f"  {self._keys[title_id]} "
+            shared = sum(1 for gram in grams if gram in padded)
+            dice = 2 * shared / (len(grams) + self._gram_counts[title_id])
+            ranked.append((shared / len(grams), dice, title_id))
+        ranked.sort(reverse=True)
+        rescore = [title_id for _, _, title_id in ranked[:self.rescored]]
+
+        # Titles whose subtitle initials are a query word and whose title
+        # has every other query word
+        words = key.split()
+        for word in words:
+            for title_id in self._acronyms.get(word, ()):
+                title_words = set(self._keys[title_id].split())
+                if all(other in title_words for other in words if other != word):
+                    rescore.append(title_id)
+
+        best_title, best_score = None, 0.0
+        for title_id in rescore:
+            score = self._score(key, title_id, best_score)
+            if score > best_score:
+                best_title, best_score = self.titles[title_id], score
+
+        if best_score < min_confidence:
+            return None, best_score
+        return best_title, best_score
+
+    def _score(self, key, title_id, floor):
+        """Confidence that key names the title, if it beats floor (else <= floor)"""
+        best = self.similarity(key, self._keys[title_id], floor)
+        subtitles = self._subtitles.get(title_id)
+        if subtitles is None:
+            return best
+
+        series, segments = subtitles
+        # Series words lead the query ("zelda ocarina of time"); a subtitle
+        # may share words with the series, so only the leading run goes
+        words = key.split()
+        named = 0
+        while named < len(words) and words[named] in series:
+            named += 1
+        named_series = named > 0
+        rest = ' '.join(words[named:])
+        for segment, initials in segments:
+            if not rest:
+                break
+            if initials and rest == initials and named_series:
+                best = max(best, self.ACRONYM_SCORE)
+            elif named_series or ' ' in segment:
+                # A one-word subtitle alone is too vague to go by
+                floor_here = max(best, floor) / self.SUBTITLE_WEIGHT
+                best = max(best, self.SUBTITLE_WEIGHT * self.similarity(rest, segment, floor_here))
+        return best
+
+    @classmethod
+    def similarity(cls, a, b, floor=0.0):
+        """1 - Damerau distance / length; at most floor once it cannot beat it"""
+        longest = max(len(a), len(b))
+        if not longest:
+            return 1.0
+        # The length difference bounds the distance from below
+        if 1 - abs(len(a) - len(b)) / longest <= floor:
+            return 0.0
+        max_distance = int((1 - floor) * longest)
+        return 1 - cls.edit_distance(a, b, max_distance) / longest
+
+    @staticmethod
+    def edit_distance(a, b, max_distance=None):
+        """Damerau distance (optimal string alignment) between two strings
+
+        Insertions, deletions, substitutions and swaps of adjacent
+        characters each count as one edit. Stops early once the distance is
+        known to exceed max_distance and returns max_distance + 1 in that
+        case.
+        """
+        if len(a) < len(b):
+            a, b = b, a
+        before = None
+        previous = list(range(len(b) + 1))
+        for i, char_a in enumerate(a, 1):
+            current = [i]
+            for j, char_b in enumerate(b, 1):
+                distance = min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b))
+                if (before is not None and j > 1 and char_a == b[j - 2]
+                        and a[i - 2] == char_b):
+                    distance = min(distance, before[j - 2] + 1)
+                current.append(distance)
+            if max_distance is not None and min(current) > max_distance:
+                return max_distance + 1
+            before, previous = previous, current
+        return previous[-1]
@@ -1,19 +1,74 @@
 import pandas as pd
-import requests
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import matplotlib.pyplot as plt
 import seaborn as sns
+from llm_backends import LLMBackend, OllamaBackend
+from post_table import PostTable
+from text_cleaner import TextCleaner
 
 
 class GameAnalyzer:
-    def __init__(self):
-        self.api_url = "http://localhost:11434/api/generate"
-        self.model_name = "mistral"
+    ANALYSIS_PROMPT = (
+        "Task: Extract video game information from this user post and metadata.\n"
+        "Return format must be exactly:\n"
+        "'game title;year;developer'\n"
+        "Rules:\n"
+        "- If no game found, return 'None;;'\n"
+        "- If game found but year unknown, return 'game title;;developer'\n"
+        "- If game found but developer unknown, return 'game title;year;'\n"
+        "- If only game found, return 'game title;;'\n"
+        "No other format accepted. No extra text or explanations.\n"
+        "Data sample: {text}"
+    )
+    BATCH_PROMPT = (
+        "Task: Extract video game information from each numbered user post below.\n"
+        "Return exactly one line per post, in the same order, formatted as:\n"
+        "'number. game title;year;developer'\n"
+        "Rules:\n"
+        "- If no game found, return 'number. None;;'\n"
+        "- If game found but year unknown, return 'number. game title;;developer'\n"
+        "- If game found but developer unknown, return 'number. game title;year;'\n"
+        "- If only game found, return 'number. game title;;'\n"
+        "No other format accepted. No extra text or explanations.\n"
+        "Posts:\n{posts}"
+    )
+    BATCH_SLOT_PATTERN = re.compile(r'^\s*\[?(\d+)\s*[\].:)]\s*(.*)$')
+    ANSWER_TOKENS = 24  # output tokens reserved per post in a batch
+
+    def __init__(self, max_workers=4, cache=None, context_window=4096,
+                 fast_path=None, title_resolver=None, min_title_confidence=0.8,
+                 backend=None, stream=False, num_predict=48, stop=("\n\n",)):
+        # Any LLMBackend; by default a local Ollama with one pooled
+        # connection per worker
+        self.backend = backend or OllamaBackend(pool_size=max(max_workers, 10))
+        self.max_workers = max_workers  # LLM requests in flight
+        self.context_window = context_window  # model num_ctx, in tokens
+        self.stream = stream  # read answers token by token, stop at the first valid line
+        self.num_predict = num_predict  # max tokens generated for one post
+        self.stop = list(stop)  # stop sequences for one-post answers
+        self.stats = {}
+        self.llm_requests = 0
+        self.llm_seconds = 0.0  # time spent waiting on _generate requests
+        self.llm_tokens = 0  # tokens generated for _generate requests
+        self._requests_lock = threading.Lock()
+        self.fast_path = fast_path  # optional GameAnalyzerText
+        self.title_resolver = title_resolver  # optional FuzzyTitleResolver
+        self.min_title_confidence = min_title_confidence
+        self.text_cleaner = TextCleaner()
+        self.cache = cache  # optional LLMCache
+        if self.cache is not None:
+            # Batched answers are cached per post, so either prompt changing
+            # invalidates the cache
+            self.cache.set_prompt_template(
+                self.ANALYSIS_PROMPT + self.BATCH_PROMPT)
 
     def clean_text(self, text):
         """Remove URLs and special chars"""
-        return re.sub(r'http\S+|[@#]\w+|[^\w\s]', '', text.lower())
+        return self.text_cleaner.clean_for_llm(text)
 
     def normalize_title(self, title):
         """Normalize game title for comparison"""
@@ -21,110 +76,360 @@ class GameAnalyzer:
             return None
         return ''.join(sorted(char.lower() for char in title if char.isalnum()))
 
+    def resolve_title(self, title):
+        """Return (group key, canonical title, confidence) for a raw title
+
+        With a title resolver, titles confidently matched to a known game
+        are grouped under that game; anything else falls back to
+        normalize_title with confidence 0.
+        """
+        if not title or title.lower() == 'none':
+            return None, None, 0.0
+        if self.title_resolver is not None:
+            canonical, confidence = self.title_resolver.resolve(
+                title, self.min_title_confidence)
+            if canonical:
+                return self.title_resolver.normalize(canonical), canonical, confidence
+        return self.normalize_title(title), title, 0.0
+
     def group_similar_titles(self, df):
-        """Group similar game titles and count mentions and likes"""
-        title_groups = {}
+        """Group similar game titles and count mentions and likes
 
-        # Create groups of similar titles
-        for idx, row in df.iterrows():
-            title = row['game_title']
-            if title and title.lower() != 'none':
-                norm_title = self.normalize_title(title)
-                if norm_title in title_groups:
-                    title_groups[norm_title]['mentions'] += 1
-                    title_groups[norm_title]['total_likes'] += row['like_count']
-                    title_groups[norm_title]['variants'].add(title)
-                    title_groups[norm_title]['uris'].append(
-                        row['uri'])  # Add URI to list
-                else:
-                    title_groups[norm_title] = {
-                        'canonical': title,
-                        'mentions': 1,
-                        'total_likes': row['like_count'],
-                        'variants': {title},
-                        'uris': [row['uri']]  # Initialize URI list
-                    }
-
-        # Add mention counts and total likes to DataFrame
-        df['mentions'] = df['game_title'].apply(
-            lambda x: title_groups.get(
-                self.normalize_title(x), {}).get('mentions', 0)
-            if x and x.lower() != 'none' else 0
-        )
+        Each distinct title is resolved once, the group key is added as a
+        column and mentions, likes, variants and URIs are aggregated with a
+        single groupby before being mapped back onto the rows.
+        """
+        resolved = {
+            title: self.resolve_title(title) if isinstance(title, str)
+            else (None, None, 0.0)
+            for title in df['game_title'].unique()
+        }
+        keys = df['game_title'].map({t: r[0] for t, r in resolved.items()})
 
-        df['total_likes'] = df['game_title'].apply(
-            lambda x: title_groups.get(
-                self.normalize_title(x), {}).get('total_likes', 0)
-            if x and x.lower() != 'none' else 0
+        keyed = pd.DataFrame({
+            'key': keys,
+            'title': df['game_title'],
+            'like_count': df['like_count'],
+            'uri': df['uri']
+        })[keys.notna()]
+        groups = keyed.groupby('key', sort=False).agg(
+            first_title=('title', 'first'),
+            mentions=('title', 'size'),
+            total_likes=('like_count', 'sum'),
+            variants=('title', lambda titles: set(titles)),
+            uris=('uri', list)
         )
+        groups['all_uris'] = groups['uris'].map(' - '.join)
 
-        # Add all URIs as concatenated string
-        df['all_uris'] = df['game_title'].apply(
-            lambda x: ' - '.join(title_groups.get(self.normalize_title(x),
-                                 {}).get('uris', []))
-            if x and x.lower() != 'none' else ''
-        )
+        # Add mention counts, total likes and all URIs to DataFrame
+        df['mentions'] = keys.map(groups['mentions']).fillna(0).astype('int64')
+        total_likes = keys.map(groups['total_likes']).fillna(0)
+        if pd.api.types.is_integer_dtype(df['like_count']):
+            total_likes = total_likes.astype('int64')
+        df['total_likes'] = total_likes
+        df['all_uris'] = keys.map(groups['all_uris']).fillna('')
+
+        title_groups = {}
+        for key, group in zip(groups.index, groups.itertuples(index=False)):
+            _, canonical, confidence = resolved[group.first_title]
+            title_groups[key] = {
+                'canonical': canonical,
+                'confidence': confidence,
+                'mentions': int(group.mentions),
+                'total_likes': group.total_likes,
+                'variants': group.variants,
+                'uris': group.uris
+            }
 
         return df, title_groups
 
-    def query_local_llm(self, text, temperature=0.3):
-        """Query local Ollama LLM for game title extraction with metadata"""
-        analysis_prompt = (
-            "Task: Extract video game information from this user post and metadata.\n"
-            "Return format must be exactly:\n"
-            "'game title;year;developer'\n"
-            "Rules:\n"
-            "- If no game found, return 'None;;'\n"
-            "- If game found but year unknown, return 'game title;;developer'\n"
-            "- If game found but developer unknown, return 'game title;year;'\n"
-            "- If only game found, return 'game title;;'\n"
-            "No other format accepted. No extra text or explanations.\n"
-            f"Data sample: {text}"
-        )
+    @property
+    def model_name(self):
+        return self.backend.model
 
+    valid_answer = staticmethod(LLMBackend.valid_answer)
+    find_answer = staticmethod(LLMBackend.find_answer)
+
+    def _generate(self, prompt, temperature, options=None, stream=False):
+        """Send one prompt to the backend, return the response text or None
+
+        With stream, the answer is read as it is generated and cut off
+        after its first valid 'title;year;developer' line.
+        """
+        tokens = 0
+        start = time.perf_counter()
         try:
-            response = requests.post(
-                self.api_url,
-                json={
-                    "model": self.model_name,
-                    "prompt": analysis_prompt,
-                    "temperature": temperature,
-                    "stream": False
-                }
-            )
-            if response.status_code == 200:
-                return response.json().get('response', '').strip()
-            print(f"Query failed with status {response.status_code}")
-            return "None;;"
+            text, tokens = self.backend.generate(prompt, temperature, options, stream)
+            return text
         except Exception as e:
             print(f"Query error: {str(e)}")
+            return None
+        finally:
+            with self._requests_lock:
+                self.llm_requests += 1
+                self.llm_seconds += time.perf_counter() - start
+                self.llm_tokens += tokens
+
+    def warm_up(self):
+        """Load the model now (and keep it loaded, for Ollama)"""
+        return self.backend.warm_up()
+
+    def close(self):
+        self.backend.close()
+
+    def _cache_key(self, text, temperature, batch=False):
+        """Cache key of the answer for one post
+
+        Answers read from a packed prompt (batch=True) are kept apart from
+        single-post ones: they come from another prompt and depend on the
+        posts sharing it.
+        """
+        if self.cache is None:
+            return None
+        if batch:
+            return self.cache.make_key(
+                self.model_name, self.BATCH_PROMPT, temperature, text,
+                options={"batch": True, "num_ctx": self.context_window,
+                         "answer_tokens": self.ANSWER_TOKENS})
+        # Length limits, stop sequences and early stopping all shape the answer
+        return self.cache.make_key(
+            self.model_name, self.ANALYSIS_PROMPT, temperature, text,
+            options={"num_predict": self.num_predict, "stop": self.stop,
+                     "stream": self.stream})
+
+    def query_local_llm(self, text, temperature=0.3):
+        """Query the LLM for game title extraction with metadata"""
+        cache_key = self._cache_key(text, temperature)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        options = {}
+        if self.num_predict:
+            options["num_predict"] = self.num_predict
+        if self.stop:
+            options["stop"] = self.stop
+        result = self._generate(
+            self.ANALYSIS_PROMPT.format(text=text), temperature,
+            options=options, stream=self.stream)
+        if result is None:
             return "None;;"
+        # Only the answer line is kept, without any preamble around it.
+        # Malformed answers are returned but not cached, so a rerun asks again
+        answer = self.find_answer(result)
+        if answer is None:
+            return result
+        if cache_key is not None:
+            self.cache.put(cache_key, answer)
+        return answer
+
+    @staticmethod
+    def estimate_tokens(text):
+        """Rough token count (about 4 characters per token)"""
+        return len(text) // 4 + 1
+
+    def plan_batches(self, texts, max_batch_size=20):
+        """Split texts into index batches that fit the model context window"""
+        budget = self.context_window - self.estimate_tokens(
+            self.BATCH_PROMPT.format(posts=''))
+        batches = []
+        current, used = [], 0
+        for idx, text in enumerate(texts):
+            cost = self.estimate_tokens(text) + self.ANSWER_TOKENS + 4
+            if current and (len(current) >= max_batch_size or used + cost > budget):
+                batches.append(current)
+                current, used = [], 0
+            current.append(idx)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
 
-    def extract_game_titles(self, df):
-        """Process DataFrame and extract potential game titles"""
-        df['clean_text'] = df['text'].apply(self.clean_text)
-
-        games_data = []
-        for idx, row in df.iterrows():
-            try:
-                text_with_metadata = (
-                    f"Text: {row['clean_text']}\n"
-                    f"Tags: {', '.join(row['tags'])}\n"
-                    f"Image descriptions: {', '.join(row['image_alts']) if row['image_alts'] else 'No images'}"
-                )
-                result = self.query_local_llm(text_with_metadata)
-                game_title, year, developer = result.split(';')
-                games_data.append({
-                    'game_title': game_title,
-                    'release_year': year if year else None,
-                    'developer': developer if developer else None
-                })
-                print(f"Processed {idx + 1}/{len(df)} posts")
-            except Exception as e:
-                print(f"Error processing post {idx}: {str(e)}")
-                games_data.append(
-                    {'game_title': 'None', 'release_year': None, 'developer': None})
+    def parse_batch_response(self, response, n_slots):
+        """Map numbered 'n. title;year;developer' lines back to their slots
+
+        Returns a list with one answer per slot, None where the slot is
+        missing or not in the expected format.
+        """
+        answers = [None] * n_slots
+        for line in (response or '').splitlines():
+            match = self.BATCH_SLOT_PATTERN.match(line)
+            if not match:
                 continue
+            slot = int(match.group(1)) - 1
+            answer = self.valid_answer(match.group(2))
+            if 0 <= slot < n_slots and answers[slot] is None and answer:
+                answers[slot] = answer
+        return answers
+
+    def query_local_llm_batch(self, texts, temperature=0.3):
+        """Extract games for several posts with one packed prompt
+
+        Posts with a cached single-post or batch answer are answered from
+        the cache; the rest share a single prompt with numbered slots.
+        Slots the model leaves out or garbles fall back to query_local_llm.
+        """
+        results = [None] * len(texts)
+        keys = [self._cache_key(text, temperature, batch=True) for text in texts]
+        pending = []
+        for i, key in enumerate(keys):
+            if key is not None:
+                results[i] = (self.cache.get(self._cache_key(texts[i], temperature))
+                              or self.cache.get(key))
+            if results[i] is None:
+                pending.append(i)
+
+        if len(pending) == 1:
+            results[pending[0]] = self.query_local_llm(
+                texts[pending[0]], temperature)
+            return results
+
+        if pending:
+            posts = '\n'.join(
+                f"[{slot}]\n{texts[i]}" for slot, i in enumerate(pending, 1))
+            response = self._generate(
+                self.BATCH_PROMPT.format(posts=posts), temperature,
+                # Generation is capped at the answer budget plan_batches reserved
+                options={"num_ctx": self.context_window,
+                         "num_predict": self.ANSWER_TOKENS * len(pending)})
+            answers = self.parse_batch_response(response, len(pending))
+
+            for i, answer in zip(pending, answers):
+                if answer is None:
+                    results[i] = self.query_local_llm(texts[i], temperature)
+                    continue
+                results[i] = answer
+                if keys[i] is not None:
+                    self.cache.put(keys[i], answer)
+        return results
+
+    def build_post_prompt(self, clean_text, tags, image_alts):
+        """Format cleaned post text and metadata as the LLM data sample"""
+        return (
+            f"Text: {clean_text}\n"
+            f"Tags: {', '.join(tags)}\n"
+            f"Image descriptions: {', '.join(image_alts) if image_alts else 'No images'}"
+        )
+
+    def _parse_result(self, idx, result):
+        """Split a 'title;year;developer' answer into fields"""
+        try:
+            game_title, year, developer = result.split(';')
+            return {
+                'game_title': game_title,
+                'release_year': year if year else None,
+                'developer': developer if developer else None
+            }
+        except Exception as e:
+            print(f"Error processing post {idx}: {str(e)}")
+            return {'game_title': 'None', 'release_year': None, 'developer': None}
+
+    def _extract_batch(self, indices, texts):
+        """Query the LLM for one post, or a batch with one packed prompt"""
+        if len(texts) == 1:
+            results = [self.query_local_llm(texts[0])]
+        else:
+            results = self.query_local_llm_batch(texts)
+        return [self._parse_result(idx, result)
+                for idx, result in zip(indices, results)]
+
+    def extract_game_titles(self, df, max_workers=None, batch_size=1):
+        """Process DataFrame (or PostTable) and extract potential game titles
+
+        Extraction is tiered: posts whose 'Day NN: <Title>' line names a
+        known game are resolved by the fast path, then the cache and finally
+        the LLM handle the rest. LLM posts are sent from a thread pool with
+        at most max_workers requests in flight; results keep the DataFrame
+        row order. With batch_size > 1, up to batch_size posts share one
+        prompt, fewer if they would not fit the model context window.
+        A PostTable is returned as a DataFrame without the text columns.
+        """
+        if isinstance(df, PostTable):
+            # Text and list columns are decoded from the table post by post;
+            # only the light columns become a DataFrame
+            table = df
+            df = table.to_pandas(columns=['uri', 'handle', 'created_at', 'like_count'])
+            posts = (
+                (text, self.clean_text(text), tags, image_alts)
+                for text, tags, image_alts in zip(
+                    table.iter_column('text'), table.iter_column('tags'),
+                    table.iter_column('image_alts')))
+        else:
+            df['clean_text'] = self.text_cleaner.clean_for_llm_series(df['text'])
+            posts = zip(df['text'], df['clean_text'], df['tags'], df['image_alts'])
+        workers = max_workers or self.max_workers
+        total = len(df)
+        games_data = [None] * total
+        prompts = [None] * total
+
+        for idx, (text, clean_text, tags, image_alts) in enumerate(posts):
+            if self.fast_path is not None:
+                title = self.fast_path.extract_confident_title(text)
+                if title:
+                    games_data[idx] = {
+                        'game_title': title, 'release_year': None, 'developer': None}
+                    continue
+            prompts[idx] = self.build_post_prompt(clean_text, tags, image_alts)
+        llm_indices = [idx for idx in range(total) if games_data[idx] is None]
+
+        requests_before = self.llm_requests
+        seconds_before = self.llm_seconds
+        tokens_before = self.llm_tokens
+        hits_before = self.cache.hits if self.cache is not None else 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            if batch_size > 1:
+                batches = [
+                    [llm_indices[i] for i in batch]
+                    for batch in self.plan_batches(
+                        [prompts[idx] for idx in llm_indices], batch_size)
+                ]
+            else:
+                batches = [[idx] for idx in llm_indices]
+            results = executor.map(
+                self._extract_batch, batches,
+                [[prompts[idx] for idx in batch] for batch in batches])
+
+            # map() yields in submission order, whatever order requests finish
+            done = total - len(llm_indices)
+            for batch, data in zip(batches, results):
+                for idx, item in zip(batch, data):
+                    games_data[idx] = item
+                done += len(batch)
+                print(f"Processed {done}/{total} posts")
+        elapsed = time.perf_counter() - start
+
+        cache_hits = (self.cache.hits - hits_before) if self.cache is not None else 0
+        llm_requests = self.llm_requests - requests_before
+        tiers = {
+            'fast_path': total - len(llm_indices),
+            'cache': cache_hits,
+            'llm': len(llm_indices) - cache_hits
+        }
+        self.stats = {
+            'posts': total,
+            'workers': workers,
+            'batch_size': batch_size,
+            'tiers': tiers,
+            'llm_requests': llm_requests,
+            'seconds_per_request': (
+                (self.llm_seconds - seconds_before) / llm_requests if llm_requests else 0.0),
+            'tokens_per_request': (
+                (self.llm_tokens - tokens_before) / llm_requests if llm_requests else 0.0),
+            'seconds': elapsed,
+            'posts_per_sec': total / elapsed if elapsed else 0.0
+        }
+        print(f"Extracted {total} posts in {elapsed:.1f}s "
+              f"({self.stats['posts_per_sec']:.2f} posts/sec, {workers} workers, "
+              f"{self.stats['llm_requests']} LLM requests, "
+              f"{self.stats['seconds_per_request'] * 1000:.0f} ms and "
+              f"{self.stats['tokens_per_request']:.0f} tokens per request)")
+        for tier, count in tiers.items():
+            share = count / total if total else 0.0
+            print(f"  {tier}: {count} posts ({share:.1%})")
+        if self.cache is not None:
+            self.stats['cache'] = self.cache.stats()
 
         # Add new columns to DataFrame
         df['game_title'] = [d['game_title'] for d in games_data]
@@ -139,21 +444,10 @@ class GameAnalyzer:
         """Test LLM connection with debug info"""
         print("Testing LLM connection...")
         try:
-            response = requests.post(
-                self.api_url,
-                json={
-                    "model": self.model_name,
-                    "prompt": "Reply only with 'OK' nothing else",
-                    "stream": False
-                }
-            )
-            print(f"Response status: {response.status_code}")
-            if response.status_code == 200:
-                result = response.json()
-                print(f"Response text: {result.get('response', '')}")
-                # Consider any successful response as valid
-                return True
-            return False
+            text, _ = self.backend.generate("Reply only with 'OK' nothing else", 0.0)
+            print(f"Response text: {text}")
+            # Consider any successful response as valid
+            return True
         except Exception as e:
             print(f"Connection error: {str(e)}")
             return False
@@ -0,0 +1,249 @@
+import hashlib
+import pandas as pd
+import re
+from collections import Counter
+from data_manager import DataManager
+from fuzzy_titles import FuzzyTitleResolver
+from known_games_index import KnownGamesIndex
+from post_table import PostTable
+from text_cleaner import TextCleaner
+from title_matcher import TitleMatcher
+
+
+class GameAnalyzerText:
+    # "Day 05: Fable II", "day 4 - Super Metroid" or "Day 10" with the title
+    # on a line of its own, as posted from the challenge template
+    DAY_TEMPLATE = re.compile(
+        r'\bday\s*#?\s*\d{1,2}(?:\s*[:\-\u2013\u2014.][ \t]*|[ \t]*\n\s*|[ \t]+)'
+        r'(?P<title>[^\s#][^\n#]*)',
+        re.IGNORECASE)
+    # "Day 10" right before a title, with no separator
+    DAY_PREFIX = re.compile(r'\bday\s*#?\s*\d{1,2}\s*$', re.IGNORECASE)
+    # Words a title-cased mention may leave lowercase
+    MINOR_WORDS = {"a", "an", "and", "at", "by", "for", "from", "i", "in", "of",
+                   "on", "or", "the", "to", "vs", "with"}
+
+    def __init__(self):
+        self.mask_phrases = list(TextCleaner.MASK_PHRASES)
+        self.text_cleaner = TextCleaner(self.mask_phrases)
+        self.rejected_words = [
+            "the", "and", "day", "game", "games", "playing",
+            "today", "tomorrow", "yesterday", "now", "later",
+            "first", "second", "third", "next", "last",
+            "here", "there", "this", "that", "with",
+            "best", "worst", "ever", "never", "always", "retro",
+            "retrogames"
+        ]
+        self.known_games = self._load_known_games()
+        self._title_matcher = None  # built on first use, see title_matcher
+        self._title_resolver = None  # built on first use, see title_resolver
+        self.unmatched_uris = []  # Store unmatched URIs
+        self.total_processed = 0
+        self.matched_count = 0
+
+    def _load_known_games(self):
+        """Load known games from TextDump_GameOnly.txt
+
+        Maps lowercase title to the title as written in the dump. The dump
+        is compiled once into a memory-mapped index (see known_games_index),
+        next to which the title automaton and fuzzy resolver are cached too.
+        """
+        try:
+            return KnownGamesIndex.load_or_build('TextDump_GameOnly.txt')
+        except FileNotFoundError:
+            return {}
+
+    def _cached(self, name, build):
+        """build(), kept next to the known-games index when there is one"""
+        if isinstance(self.known_games, KnownGamesIndex):
+            return self.known_games.cached(name, build)
+        return build()
+
+    @property
+    def title_matcher(self):
+        """Automaton over multi-word known titles, shared by all posts"""
+        if self._title_matcher is None:
+            # Another rejected word list gets its own cached automaton
+            words = hashlib.sha1('\n'.join(sorted(self.rejected_words)).encode('utf-8'))
+            self._title_matcher = self._cached(
+                f"matcher{TitleMatcher.VERSION}-{words.hexdigest()[:12]}",
+                lambda: TitleMatcher(
+                    self.known_games, min_tokens=2, excluded=self.rejected_words))
+        return self._title_matcher
+
+    @property
+    def title_resolver(self):
+        """Fuzzy resolver from raw titles to known games"""
+        if self._title_resolver is None:
+            self._title_resolver = self._cached(
+                f"resolver{FuzzyTitleResolver.VERSION}",
+                lambda: FuzzyTitleResolver(self.known_games.values()))
+        return self._title_resolver
+
+    def strip_mask_phrases(self, text):
+        """Remove the challenge boilerplate sentences"""
+        return self.text_cleaner.strip_mask_phrases(text)
+
+    def clean_text(self, text):
+        """Clean text while preserving : and ,"""
+        return self.text_cleaner.clean_for_matching(text)
+
+    def extract_confident_title(self, text):
+        """Return the known title named after 'Day NN' (the template line), or None"""
+        match = self.DAY_TEMPLATE.search(text)
+        if not match:
+            return None
+
+        candidate = match.group('title').strip()
+        # Drop trailing emoji and punctuation the dump would not contain
+        trimmed = re.sub(r'[^\w)\]!?.]+$', '', candidate)
+        for title in (candidate, trimmed, trimmed.rstrip('.!?')):
+            title_lower = title.lower()
+            if title_lower in self.rejected_words:
+                return None
+            if title_lower in self.known_games:
+                return self.known_games[title_lower]
+        return None
+
+    def match_fragments(self, cleaned_text):
+        """Match whole comma/newline separated fragments against known games"""
+        # Split by common separators
+        potential_titles = re.split(r'[,\n]', cleaned_text)
+        potential_titles = [title.strip()
+                            for title in potential_titles if title.strip()]
+
+        # Match against known games and filter out rejected words
+        matched_titles = []
+        for title in potential_titles:
+            title_lower = title.lower()
+            # Check if it's a single word and not in known games
+            if len(title_lower.split()) == 1 and title_lower not in self.known_games:
+                continue
+            # Check other rejection criteria
+            if title_lower not in self.rejected_words and title_lower in self.known_games:
+                matched_titles.append(title)
+        return matched_titles
+
+    def plausible_mention(self, text, start, end):
+        """Whether text[start:end] reads as a game title rather than a phrase
+
+        Many known titles are everyday phrases ("Up All Night", "After
+        School"), so an automaton match only counts when it stands on its
+        own (a line, list item or 'Day NN' entry, not bordered by other
+        words) or is written title-cased with a capital beyond its first
+        word.
+        """
+        before = text[:start].rstrip(' \t')
+        after = text[end:].lstrip(' \t')
+        if (not before or not before[-1].isalnum() or self.DAY_PREFIX.search(before)) \
+                and (not after or not after[0].isalnum()):
+            return True
+
+        words = TitleMatcher.TOKEN_PATTERN.findall(text[start:end])
+        significant = [word for word in words[1:] if word.lower() not in self.MINOR_WORDS]
+        return bool(significant) and all(
+            word[0].isupper() or word[0].isdigit() for word in [words[0]] + significant)
+
+    def match_titles(self, text, cleaned_text=None):
+        """Known game titles mentioned in a post
+
+        Multi-word titles are spotted anywhere in the text by the title
+        automaton, if plausible_mention accepts them; single words only
+        count when they are a whole fragment. cleaned_text is
+        clean_text(text) when the caller already has it.
+        """
+        if cleaned_text is None:
+            cleaned_text = self.clean_text(text)
+
+        matched_titles = [
+            title for title in self.match_fragments(cleaned_text)
+            if ' ' not in title
+        ]
+        matched_titles.extend(self.title_matcher.find_all(
+            self.strip_mask_phrases(text), accept=self.plausible_mention))
+        return matched_titles
+
+    def extract_game_titles(self, text, uri=None):
+        """Extract potential game titles and track unmatched posts"""
+        matched_titles = self.match_titles(text)
+
+        # Log unmatched post if no valid matches found
+        if uri:
+            self.total_processed += 1
+            if not matched_titles:
+                self.unmatched_uris.append(uri)
+            else:
+                self.matched_count += 1
+
+        return matched_titles
+
+    def count_posts(self, posts):
+        """Count game mentions in (text, uri) pairs
+
+        Unlike extract_game_titles this leaves the instance counters alone,
+        so it can run in worker processes; merge the results with
+        merge_counts.
+        """
+        counts = {'game_counts': Counter(), 'unmatched_uris': [],
+                  'total_processed': 0, 'matched_count': 0}
+        for text, uri in posts:
+            matched_titles = self.match_titles(text)
+            counts['game_counts'].update(matched_titles)
+            if uri:
+                counts['total_processed'] += 1
+                if not matched_titles:
+                    counts['unmatched_uris'].append(uri)
+                else:
+                    counts['matched_count'] += 1
+        return counts
+
+    def merge_counts(self, counts):
+        """Add count_posts results to the instance counters"""
+        self.total_processed += counts['total_processed']
+        self.matched_count += counts['matched_count']
+        self.unmatched_uris.extend(counts['unmatched_uris'])
+
+    def analyze_posts(self, json_file):
+        """Analyze posts and count game occurrences
+
+        json_file is a posts .json or .jsonl[.gz|.zst] file, or a PostTable.
+        """
+        if isinstance(json_file, PostTable):
+            posts = zip(json_file.iter_column('text'), json_file.iter_column('uri'))
+        else:
+            posts = ((post.get('text') or '', post.get('uri'))
+                     for post in DataManager.read_posts(json_file))
+
+        counts = self.count_posts(posts)
+        return self.finish_analysis(counts)
+
+    def finish_analysis(self, counts):
+        """Merge counts, report them and save unmatched URIs
+
+        Returns {title: mentions}, most mentioned first.
+        """
+        self.merge_counts(counts)
+        print(f"\nTotal posts processed: {self.total_processed}")
+        print(f"Posts with matches: {self.matched_count}")
+        print(f"Posts without matches: {len(self.unmatched_uris)}")
+
+        # Save unmatched URIs after processing all posts if unmatched URIs exist
+        if self.unmatched_uris:
+            self.save_unmatched_uris()
+            print(f"Saved {len(self.unmatched_uris)} unmatched URIs to file")
+
+        # Count occurrences
+        return dict(counts['game_counts'].most_common())
+
+    def save_unmatched_uris(self, filename='unmatched_posts.txt'):
+        """Save unmatched URIs to file"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            for uri in self.unmatched_uris:
+                f.write(f"{uri}\n")
+
+    def print_analysis(self, game_counts):
+        """Print analysis results"""
+        print("\nGame Mentions Analysis:")
+        print("----------------------")
+        for game, count in game_counts.items():
+            print(f"{game}: {count} mentions")
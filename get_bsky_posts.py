@@ -1,11 +1,9 @@
-from atproto import Client
-from pprint import pprint
-from dataclasses import asdict
-from bsky_search import BskySearch
-from bsky_feed import BskyFeed
+import asyncio
+from bsky_fetcher import AsyncBskyFetcher, JsonlPageSink
+from crawl_state import CrawlStateStore
 from data_manager import DataManager
-import json
-from datetime import datetime, timedelta
+from post_store import PostStore
+from datetime import datetime
 
 msg = "Trying to connect to blue sky social"
 print(msg)
@@ -14,36 +12,27 @@ print(msg)
 
 
 try:
-    client = Client()
-    response = client.login('app-attak-afu.bsky.social', 'M$4d3znSZAm:')
-
-    # feed = BskyFeed().get_user_timeline(client)
-
-    # if feed:
-    #     print("\n\nFeed fetched\n")
-    #     print(f"number of posts in feed : {len(feed)}")
-
-    # Search for posts
-    for day in range(1, 32):
-        current_date = datetime(2024, 5, day)
-        next_date = current_date + timedelta(days=1)
-
-        search_result = BskySearch().get_posts_with_hashtag(
-            client,
-            "gamechallenge",
-            since=current_date.strftime('%Y-%m-%d'),
-            until=next_date.strftime('%Y-%m-%d')
-        )
-
-        if search_result:
-            print("number of #gamechallenge posts: ", len(search_result))
-            print(
-                f"saving to file : posts_gamechallenge_{current_date.strftime('%Y%m%d')}.json")
-            dm = DataManager()
-            dm.save_raw_json(
-                {"posts": search_result},
-                f"posts_gamechallenge_{current_date.strftime('%Y%m%d')}.json"
-            )
+    fetcher = AsyncBskyFetcher(max_concurrency=4)
+    fetcher.login('app-attak-afu.bsky.social', 'M$4d3znSZAm:')
+
+    # Search for posts, one window per day, several days in parallel.
+    # Each day is streamed to posts_gamechallenge_YYYYMMDD.jsonl; progress
+    # is checkpointed so a rerun only fetches missing days and new posts
+    # (a day fetched again from the start rewrites its file).
+    # Every post is also upserted into data/posts.sqlite, one row per URI
+    windows = AsyncBskyFetcher.day_windows(datetime(2024, 5, 1), 31)
+    state = CrawlStateStore()
+    failures = asyncio.run(fetcher.crawl(
+        "gamechallenge",
+        windows,
+        JsonlPageSink(DataManager(post_store=PostStore()), "gamechallenge",
+                      state=state),
+        state=state
+    ))
+
+    if failures:
+        print(f"{len(failures)} days failed: {', '.join(sorted(failures))}. "
+              f"Rerun to resume them.")
 
 except Exception as e:
     print(f"Error: {str(e)}")
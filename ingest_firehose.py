@@ -0,0 +1,18 @@
+import asyncio
+from crawl_state import CrawlStateStore
+from firehose_ingest import FirehoseIngestor
+from post_store import PostStore
+
+print("Listening to the Bluesky firehose for #gamechallenge posts")
+
+# Matching posts go to data/posts.sqlite as they are published. The
+# firehose position is saved after every batch, so stopping (Ctrl+C) and
+# restarting picks up where it left off
+ingestor = FirehoseIngestor(PostStore(), state=CrawlStateStore())
+try:
+    asyncio.run(ingestor.run())
+except KeyboardInterrupt:
+    pass
+finally:
+    print(f"Stopped after {ingestor.stats['frames']} frames, "
+          f"{ingestor.stats['stored']} new posts stored")
@@ -0,0 +1,179 @@
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+
+
+class KnownGamesIndex:
+    """Read-only, memory-mapped sorted string table of known game titles
+
+    The index file holds a header, an offsets table and one entry per
+    title, 'lowercase title<TAB>title as written in the dump', sorted by
+    the lowercase title. Opening it only maps the file, so the OS page
+    cache is shared by every process using the same index. It behaves like
+    the dict GameAnalyzerText used to build: lowercase title -> title.
+
+    Lookups go through a dict built from the mapped entries on first use;
+    bisecting the file in Python is two orders of magnitude slower, and the
+    analyzers look up every fragment of every post. Objects derived from
+    all the titles, like the title automaton, can be kept next to the index
+    with cached().
+    """
+
+    MAGIC = b'KGIDX001'
+    HEADER = struct.Struct('<8sII')  # magic, entry count, padding
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, _ = self.HEADER.unpack_from(self._mmap, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"Not a known games index: {path}")
+        self._count = count
+        offsets_end = self.HEADER.size + 4 * (count + 1)
+        self._offsets = memoryview(self._mmap)[self.HEADER.size:offsets_end].cast('I')
+        self._data_start = offsets_end
+        self._lookup = None  # lowercase title -> title, see _titles
+
+    @classmethod
+    def build(cls, source='TextDump_GameOnly.txt', path='TextDump_GameOnly.idx'):
+        """Compile the plain-text dump into an index file"""
+        entries = {}
+        with open(source, 'r', encoding='utf-8') as f:
+            for line in f:
+                title = line.strip()
+                entries[title.lower().encode('utf-8')] = title.encode('utf-8')
+
+        keys = sorted(entries)
+        offsets = [0]
+        for key in keys:
+            offsets.append(offsets[-1] + len(key) + 1 + len(entries[key]))
+
+        # A private temporary file per builder: processes rebuilding at the
+        # same time each replace the index with a complete file
+        with tempfile.NamedTemporaryFile(
+                dir=os.path.dirname(os.path.abspath(path)), delete=False) as f:
+            try:
+                f.write(cls.HEADER.pack(cls.MAGIC, len(keys), 0))
+                f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+                for key in keys:
+                    f.write(key + b'\t' + entries[key])
+            except BaseException:
+                f.close()
+                os.unlink(f.name)
+                raise
+        os.chmod(f.name, 0o644)  # temporary files are created private
+        os.replace(f.name, path)
+        return path
+
+    @classmethod
+    def load_or_build(cls, source='TextDump_GameOnly.txt', path='TextDump_GameOnly.idx'):
+        """Open the index, rebuilding it first if the dump is newer"""
+        if not os.path.exists(path) or (
+                os.path.exists(source)
+                and os.path.getmtime(source) > os.path.getmtime(path)):
+            cls.build(source, path)
+        return cls(path)
+
+    def _entry(self, i):
+        start = self._data_start + self._offsets[i]
+        end = self._data_start + self._offsets[i + 1]
+        key, _, title = self._mmap[start:end].partition(b'\t')
+        return key, title
+
+    def _bisect(self, key):
+        """Index of the first entry whose key is >= key (bytes)"""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _titles(self):
+        if self._lookup is None:
+            data = self._mmap[self._data_start:]
+            offsets = self._offsets.tolist()
+            lookup = {}
+            for start, end in zip(offsets, offsets[1:]):
+                key, _, title = data[start:end].partition(b'\t')
+                lookup[key.decode('utf-8')] = title.decode('utf-8')
+            self._lookup = lookup
+        return self._lookup
+
+    def get(self, title_lower, default=None):
+        return self._titles().get(title_lower, default)
+
+    def __getitem__(self, title_lower):
+        title = self.get(title_lower)
+        if title is None:
+            raise KeyError(title_lower)
+        return title
+
+    def __contains__(self, title_lower):
+        return isinstance(title_lower, str) and title_lower in self._titles()
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._entry(i)[0].decode('utf-8')
+
+    def items(self):
+        for i in range(self._count):
+            key, title = self._entry(i)
+            yield key.decode('utf-8'), title.decode('utf-8')
+
+    def values(self):
+        for _, title in self.items():
+            yield title
+
+    def keys_with_prefix(self, prefix, limit=None):
+        """Lowercase titles starting with prefix, in sorted order"""
+        key = prefix.lower().encode('utf-8')
+        found = []
+        for i in range(self._bisect(key), self._count):
+            entry_key = self._entry(i)[0]
+            if not entry_key.startswith(key) or (limit and len(found) >= limit):
+                break
+            found.append(entry_key.decode('utf-8'))
+        return found
+
+    def cached(self, name, build):
+        """build(), pickled next to the index and reused until it is rebuilt
+
+        name identifies what build makes, including its parameters and
+        format version, e.g. 'matcher1-<hash>'. Unpickling is much faster
+        than rebuilding an automaton over every title, and the file is
+        shared by later runs and worker processes. Loading runs pickle, so
+        only the index's owner should be able to write its directory.
+        """
+        path = f"{os.path.splitext(self.path)[0]}.{name}.idx"
+        try:
+            if os.path.getmtime(path) >= os.path.getmtime(self.path):
+                with open(path, 'rb') as f:
+                    return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+            pass  # missing, stale or unreadable: rebuilt below
+
+        result = build()
+        with tempfile.NamedTemporaryFile(
+                dir=os.path.dirname(os.path.abspath(path)), delete=False) as f:
+            try:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            except BaseException:
+                f.close()
+                os.unlink(f.name)
+                raise
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, path)
+        return result
+
+    def close(self):
+        self._offsets.release()
+        self._mmap.close()
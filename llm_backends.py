@@ -0,0 +1,252 @@
+import json
+import re
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class LLMBackend:
+    """Text generation interface GameAnalyzer sends its prompts to
+
+    generate() takes Ollama-style options (num_predict, stop, num_ctx),
+    which each backend maps onto its own API, and returns (text, tokens
+    generated). With stream=True the answer is read as it is generated
+    and cut off after its first valid 'title;year;developer' line.
+    Failures are raised as exceptions.
+    """
+
+    def __init__(self, model):
+        self.model = model
+
+    @staticmethod
+    def valid_answer(line):
+        """The 'title;year;developer' answer on a single line, or None"""
+        answer = line.strip().strip("'\"")
+        return answer if answer.count(';') == 2 and '\n' not in answer else None
+
+    @classmethod
+    def find_answer(cls, text):
+        """The first valid answer line in a response, or None"""
+        for line in text.split('\n'):
+            answer = cls.valid_answer(line)
+            if answer:
+                return answer
+        return None
+
+    def first_answer(self, pieces):
+        """Join streamed text pieces, stopping at the first complete valid line
+
+        Returns (answer, pieces read); the whole text when no line is valid.
+        """
+        text, tokens, checked = '', 0, 0
+        for piece in pieces:
+            text += piece
+            tokens += 1
+            end = text.rfind('\n')
+            if end >= checked:
+                answer = self.find_answer(text[checked:end])
+                if answer:
+                    return answer, tokens
+                checked = end + 1
+        # The last line has no newline when a stop sequence ended the stream
+        answer = self.find_answer(text[checked:])
+        return answer or text.strip(), tokens
+
+    def generate(self, prompt, temperature, options=None, stream=False):
+        raise NotImplementedError
+
+    def warm_up(self):
+        """Get the model ready for the first real prompt"""
+        try:
+            self.generate("Reply only with 'OK' nothing else", 0.0, {"num_predict": 1})
+            return True
+        except Exception as e:
+            print(f"Warm-up error: {str(e)}")
+            return False
+
+    def close(self):
+        pass
+
+
+class HTTPBackend(LLMBackend):
+    """Backend behind an HTTP API, on a pooled session
+
+    Up to pool_size connections are kept open. Refused connections and
+    502/503/504 answers (a server still loading the model) are retried
+    with backoff.
+    """
+
+    def __init__(self, url, model, pool_size=10, timeout=(5, 300), retries=2):
+        super().__init__(model)
+        self.url = url
+        self.timeout = timeout  # (connect, read) seconds per request
+        retry = Retry(total=retries, backoff_factor=0.5,
+                      status_forcelist=(502, 503, 504), allowed_methods=None,
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                              max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _post(self, payload, stream=False):
+        response = self.session.post(self.url, json=payload, timeout=self.timeout,
+                                     stream=stream)
+        if response.status_code != 200:
+            response.close()
+            raise Exception(f"Query failed with status {response.status_code}")
+        return response
+
+    def _read_stream(self, response, pieces):
+        # Closing the response early drops the connection, which makes the
+        # server cancel the rest of the generation
+        try:
+            return self.first_answer(pieces(response))
+        finally:
+            response.close()
+
+    def close(self):
+        self.session.close()
+
+
+class OllamaBackend(HTTPBackend):
+    """Ollama /api/generate; keep_alive keeps the model loaded between posts"""
+
+    def __init__(self, url="http://localhost:11434/api/generate", model="mistral",
+                 keep_alive="30m", **kwargs):
+        super().__init__(url, model, **kwargs)
+        self.keep_alive = keep_alive
+
+    @staticmethod
+    def _pieces(response):
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if chunk.get('response'):
+                yield chunk['response']
+            if chunk.get('done'):
+                return
+
+    def generate(self, prompt, temperature, options=None, stream=False):
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "temperature": temperature,
+            "stream": stream,
+            "keep_alive": self.keep_alive
+        }
+        if options:
+            payload["options"] = options
+
+        response = self._post(payload, stream=stream)
+        if stream:
+            return self._read_stream(response, self._pieces)
+        result = response.json()
+        return result.get('response', '').strip(), result.get('eval_count', 0)
+
+    def warm_up(self):
+        """Load the model now and keep it loaded for keep_alive"""
+        try:
+            self._post({"model": self.model, "keep_alive": self.keep_alive})
+            return True
+        except Exception as e:
+            print(f"Warm-up error: {str(e)}")
+            return False
+
+
+class OpenAICompatibleBackend(HTTPBackend):
+    """/v1/chat/completions of llama.cpp server, vLLM and other OpenAI-style servers
+
+    num_predict and stop map to max_tokens and stop; num_ctx is set when
+    the server starts, so it is ignored here.
+    """
+
+    def __init__(self, url="http://localhost:8080/v1/chat/completions", model="mistral",
+                 api_key=None, **kwargs):
+        super().__init__(url, model, **kwargs)
+        if api_key:
+            self.session.headers['Authorization'] = f"Bearer {api_key}"
+
+    @staticmethod
+    def _pieces(response):
+        for line in response.iter_lines():
+            if not line.startswith(b'data:'):
+                continue
+            data = line[5:].strip()
+            if data == b'[DONE]':
+                return
+            choices = json.loads(data).get('choices') or [{}]
+            content = (choices[0].get('delta') or {}).get('content')
+            if content:
+                yield content
+
+    def generate(self, prompt, temperature, options=None, stream=False):
+        options = options or {}
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "stream": stream
+        }
+        if options.get("num_predict"):
+            payload["max_tokens"] = options["num_predict"]
+        if options.get("stop"):
+            payload["stop"] = options["stop"]
+
+        response = self._post(payload, stream=stream)
+        if stream:
+            return self._read_stream(response, self._pieces)
+        result = response.json()
+        text = result['choices'][0]['message'].get('content') or ''
+        return text.strip(), (result.get('usage') or {}).get('completion_tokens', 0)
+
+
+class MockBackend(LLMBackend):
+    """In-process stand-in for a model, for offline runs and load tests
+
+    Every prompt gets the same answer (a string, or a function of the
+    prompt) after latency seconds plus token_latency per generated token;
+    packed prompts get one numbered answer per [n] slot. Streaming stops
+    generating at the first valid line, like a cancelled request.
+    """
+
+    def __init__(self, answer="Fable II;2008;Lionhead Studios", latency=0.0,
+                 token_latency=0.0, ramble="", model="mock"):
+        super().__init__(model)
+        self.answer = answer
+        self.latency = latency
+        self.token_latency = token_latency
+        self.ramble = ramble  # text a chatty model adds after the answer
+
+    def _tokens(self, prompt, options):
+        answer = self.answer(prompt) if callable(self.answer) else self.answer
+        slots = re.findall(r'^\[(\d+)\]$', prompt, re.MULTILINE)
+        if slots:
+            answer = '\n'.join(f"{slot}. {answer}" for slot in slots)
+        tokens = re.findall(r'\n|[^\S\n]*\S+', answer + self.ramble)
+        tokens = tokens[:options.get('num_predict') or len(tokens)]
+        text = ''
+        for i, token in enumerate(tokens):
+            text += token
+            if any(stop in text for stop in options.get('stop') or ()):
+                return tokens[:i]
+        return tokens
+
+    def _generated(self, tokens):
+        for token in tokens:
+            time.sleep(self.token_latency)
+            yield token
+
+    def generate(self, prompt, temperature, options=None, stream=False):
+        tokens = self._tokens(prompt, options or {})
+        time.sleep(self.latency)
+        if stream:
+            return self.first_answer(self._generated(tokens))
+        time.sleep(self.token_latency * len(tokens))
+        return ''.join(tokens).strip(), len(tokens)
+
+    def warm_up(self):
+        return True
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class LLMCache:
+    """Disk-backed cache of LLM answers keyed by a hash of the full request
+
+    Keys cover model name, prompt template, temperature, generation options
+    and the data sample, so byte-identical posts are only sent to the model
+    once. Entries are evicted least-recently-used once max_entries is
+    exceeded, and the whole cache is dropped when the prompt template
+    changes.
+    """
+
+    def __init__(self, path="./data/llm_cache.sqlite", max_entries=200000,
+                 prompt_template=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, last_used REAL NOT NULL)")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        self.conn.commit()
+        self._size = self.conn.execute(
+            "SELECT COUNT(*) FROM entries").fetchone()[0]
+
+        if prompt_template is not None:
+            self.set_prompt_template(prompt_template)
+
+    @staticmethod
+    def make_key(model_name, prompt_template, temperature, text, options=None):
+        """Content hash identifying one LLM request
+
+        options are settings that change the answer (e.g. num_predict, stop,
+        streaming); keys made without them are unchanged.
+        """
+        request = [model_name, prompt_template, temperature, text]
+        if options:
+            request.append(options)
+        payload = json.dumps(request, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def set_prompt_template(self, prompt_template):
+        """Invalidate every entry if the prompt differs from the stored one"""
+        prompt_hash = hashlib.sha256(prompt_template.encode('utf-8')).hexdigest()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value FROM meta WHERE name = 'prompt_hash'").fetchone()
+            if row and row[0] == prompt_hash:
+                return
+            if row:
+                print("Prompt template changed, clearing LLM cache")
+                self.conn.execute("DELETE FROM entries")
+                self._size = 0
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('prompt_hash', ?)",
+                (prompt_hash,))
+            self.conn.commit()
+
+    def get(self, key):
+        """Return cached response or None, updating hit/miss counters"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT response FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+            return row[0]
+
+    def put(self, key, response):
+        """Store a response and evict least-recently-used entries if full"""
+        with self._lock:
+            now = time.time()
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO entries (key, response, last_used) VALUES (?, ?, ?)",
+                (key, response, now))
+            if cursor.rowcount:
+                self._size += 1
+            else:
+                self.conn.execute(
+                    "UPDATE entries SET response = ?, last_used = ? WHERE key = ?",
+                    (response, now, key))
+
+            if self._size > self.max_entries:
+                excess = self._size - self.max_entries
+                self.conn.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    "SELECT key FROM entries ORDER BY last_used LIMIT ?)", (excess,))
+                self._size -= excess
+            self.conn.commit()
+
+    def stats(self):
+        """Hit/miss counters for this session and current cache size"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': self._size
+        }
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            self.conn.execute("DELETE FROM entries")
+            self.conn.commit()
+            self._size = 0
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,88 @@
+import gc
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from data_manager import DataManager
+from game_analyzer_text import GameAnalyzerText
+
+# Analyzer used by worker processes, inherited from the parent when forking
+_worker_analyzer = None
+
+
+def _init_worker():
+    """Build the analyzer in a worker that could not inherit it"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        # The known-games index is an mmap, so every worker reads the same
+        # page cache; only the title automaton is rebuilt
+        _worker_analyzer = GameAnalyzerText()
+
+
+def _count_file(path):
+    start = time.perf_counter()
+    posts = DataManager.read_posts(path)
+    counts = _worker_analyzer.count_posts(
+        (post.get('text') or '', post.get('uri')) for post in posts)
+    return counts, time.perf_counter() - start
+
+
+class ParallelTextAnalysis:
+    """Run GameAnalyzerText over many daily files in a process pool
+
+    Files are analysed whole, one per task, by count_posts; the per-file
+    Counters and unmatched lists are merged in file order, so the result
+    equals analysing the files one after another. Where fork is available
+    the workers inherit the parent's analyzer (index and title automaton
+    already built) copy-on-write instead of loading their own.
+    """
+
+    def __init__(self, analyzer=None, max_workers=None, base_path="./data"):
+        self.analyzer = analyzer or GameAnalyzerText()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.base_path = base_path
+        self.file_timings = []
+
+    def _executor(self, workers):
+        global _worker_analyzer
+        if 'fork' in multiprocessing.get_all_start_methods():
+            self.analyzer.title_matcher  # build once, before forking
+            _worker_analyzer = self.analyzer
+            # Keep the collector from touching (and so copying) the
+            # inherited objects in every worker
+            gc.freeze()
+            return ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('fork'))
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+    def analyze_files(self, pattern='posts_gamechallenge_*.json*'):
+        """Count game mentions over every matching file
+
+        Returns {title: mentions}, most mentioned first, and updates the
+        analyzer's counters and unmatched_posts.txt like analyze_posts.
+        """
+        files = DataManager(self.base_path).post_files(pattern)
+        workers = min(self.max_workers, len(files))
+        start = time.perf_counter()
+
+        merged = {'game_counts': Counter(), 'unmatched_uris': [],
+                  'total_processed': 0, 'matched_count': 0}
+        self.file_timings = []
+        try:
+            with self._executor(workers) as executor:
+                # map() yields in file order, so merging keeps the serial order
+                for path, (counts, seconds) in zip(files, executor.map(_count_file, files)):
+                    merged['game_counts'].update(counts['game_counts'])
+                    merged['unmatched_uris'].extend(counts['unmatched_uris'])
+                    merged['total_processed'] += counts['total_processed']
+                    merged['matched_count'] += counts['matched_count']
+                    self.file_timings.append((os.path.basename(path), seconds))
+        finally:
+            # Undo _executor's gc.freeze() even when a worker or file fails
+            gc.unfreeze()
+
+        elapsed = time.perf_counter() - start
+        print(f"Analyzed {len(files)} files with {workers} workers in {elapsed:.1f}s")
+        return self.analyzer.finish_analysis(merged)
@@ -0,0 +1,110 @@
+import os
+import uuid
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # optional, only needed for the Parquet backend
+    pa = None
+    ds = None
+
+
+class ParquetDataset:
+    """Typed Parquet copy of the posts, partitioned by hashtag and day
+
+    Files live under base_path/hashtag=<tag>/day=<YYYY-MM-DD>/, so queries
+    restricted to a date range or hashtag only open the matching
+    directories, and only the requested columns are read from them.
+    """
+
+    def __init__(self, base_path="./data/parquet"):
+        if pa is None:
+            raise ImportError(
+                "pyarrow is required for the Parquet backend: pip install pyarrow")
+        self.base_path = base_path
+        self.schema = pa.schema([
+            ('uri', pa.string()),
+            ('handle', pa.string()),
+            ('created_at', pa.timestamp('us', tz='UTC')),
+            ('text', pa.string()),
+            ('tags', pa.list_(pa.string())),
+            ('like_count', pa.int32()),
+            ('image_alts', pa.list_(pa.string())),
+            ('hashtag', pa.string()),
+            ('day', pa.string())
+        ])
+        self.partitioning = ds.partitioning(
+            pa.schema([('hashtag', pa.string()), ('day', pa.string())]),
+            flavor='hive')
+
+    def _to_table(self, df, hashtag):
+        """Convert simplified posts to a table with the dataset schema"""
+        created_at = pd.to_datetime(
+            df['created_at'], utc=True, format='ISO8601', errors='coerce')
+        frame = pd.DataFrame({
+            'uri': df['uri'].astype(str),
+            # Missing handles stay null instead of becoming the string 'None'
+            'handle': df['handle'].astype('string'),
+            'created_at': created_at,
+            'text': df['text'].fillna('').astype(str),
+            'tags': df['tags'].map(lambda tags: list(tags) if isinstance(tags, list) else []),
+            'like_count': df['like_count'].fillna(0).astype('int32'),
+            'image_alts': df['image_alts'].map(
+                lambda alts: list(alts) if isinstance(alts, list) else []),
+            'hashtag': hashtag.lower(),
+            'day': created_at.dt.strftime('%Y-%m-%d').fillna('unknown')
+        })
+        return pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False)
+
+    def write(self, df, hashtag):
+        """Append simplified posts (a DataFrame) to the dataset"""
+        if df.empty:
+            return
+        ds.write_dataset(
+            self._to_table(df, hashtag),
+            self.base_path,
+            format='parquet',
+            partitioning=self.partitioning,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore'
+        )
+
+    def import_jsonl(self, data_manager, pattern, hashtag, chunksize=50000):
+        """Copy JSONL post files into the dataset chunk by chunk"""
+        rows = 0
+        for chunk in data_manager.iter_jsonl_chunks(pattern, chunksize):
+            self.write(chunk, hashtag)
+            rows += len(chunk)
+        print(f"Imported {rows} posts into {self.base_path}")
+        return rows
+
+    def query(self, start=None, end=None, hashtag=None, min_likes=None, columns=None):
+        """Load posts as a DataFrame, reading only what the filters need
+
+        start and end are inclusive 'YYYY-MM-DD' days. Day and hashtag
+        filters prune partitions; min_likes (exclusive) is pushed down to
+        the Parquet row groups.
+        """
+        if not os.path.isdir(self.base_path):
+            raise FileNotFoundError(f"No Parquet dataset at {self.base_path}")
+        dataset = ds.dataset(
+            self.base_path, format='parquet', partitioning=self.partitioning,
+            schema=self.schema)
+
+        conditions = []
+        if start:
+            conditions.append(ds.field('day') >= start)
+        if end:
+            conditions.append(ds.field('day') <= end)
+        if hashtag:
+            conditions.append(ds.field('hashtag') == hashtag.lower())
+        if min_likes is not None:
+            conditions.append(ds.field('like_count') > min_likes)
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
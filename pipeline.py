@@ -0,0 +1,203 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import Counter
+
+from game_analyzer_text import GameAnalyzerText
+
+_DONE = object()  # end-of-stream marker passed down the queues
+
+
+class _StageError:
+    def __init__(self, error):
+        self.error = error
+
+
+class StreamingPipeline:
+    """Fetch-to-leaderboard pipeline with bounded queues between stages
+
+    Pages flow through simplify -> clean -> extract stages, each in its own
+    thread, into an aggregator that yields leaderboard snapshots while the
+    crawl is still running. Every queue holds at most queue_size items, so
+    a slow stage holds back the ones before it (down to the fetcher) and
+    memory stays bounded by the queue sizes and the number of distinct
+    titles, however long the date range is.
+    """
+
+    def __init__(self, analyzer=None, post_store=None, aggregation_store=None,
+                 queue_size=64, emit_every=500, emit_interval=2.0, top_n=20):
+        self.analyzer = analyzer or GameAnalyzerText()
+        self.analyzer.title_matcher  # build the automaton before any post arrives
+        self.post_store = post_store  # optional PostStore every fetched post is upserted into
+        self.aggregation_store = aggregation_store  # optional AggregationStore to keep up to date
+        self.queue_size = queue_size
+        self.emit_every = emit_every  # posts between snapshots
+        self.emit_interval = emit_interval  # or seconds, whichever comes first
+        self.top_n = top_n
+        self.fetch_failures = {}  # {label: exception} of the last fetch_pages crawl
+        self._stop = threading.Event()
+
+    def _put(self, q, item):
+        """put() that gives up once the pipeline is stopped"""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q):
+        """get() that returns _DONE once the pipeline is stopped"""
+        while True:
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return _DONE
+
+    def _feed(self, source, out_q):
+        try:
+            for item in source:
+                if not self._put(out_q, item):
+                    return
+        except Exception as e:
+            self._put(out_q, _StageError(e))
+        self._put(out_q, _DONE)
+
+    def _stage(self, func, in_q, out_q):
+        while True:
+            item = self._get(in_q)
+            if item is _DONE or isinstance(item, _StageError):
+                self._put(out_q, item)
+                return
+            try:
+                for result in func(item):
+                    if not self._put(out_q, result):
+                        return
+            except Exception as e:
+                self._put(out_q, _StageError(e))
+                return
+
+    def simplify(self, page):
+        """Page of PostRecords or post dicts -> simplified posts
+
+        Every post goes on, including ones the post store already had from
+        another crawl or the firehose: the aggregation store counts each
+        (title, uri) once and refreshes like counts of ones it has seen.
+        """
+        posts = [post if isinstance(post, dict) else post.to_dict() for post in page]
+        if self.post_store is not None:
+            self.post_store.upsert(posts)
+        return posts
+
+    def clean(self, post):
+        post['clean_text'] = self.analyzer.clean_text(post.get('text') or '')
+        return (post,)
+
+    def extract(self, post):
+        post['titles'] = self.analyzer.match_titles(
+            post.get('text') or '', cleaned_text=post['clean_text'])
+        return (post,)
+
+    def _flush(self, pending):
+        if self.aggregation_store is not None and pending:
+            self.aggregation_store.add_mentions(pending)
+        pending.clear()
+
+    def _snapshot(self, mentions, likes, posts, matched, start, done):
+        return {
+            'posts': posts,
+            'matched': matched,
+            'seconds': time.perf_counter() - start,
+            'done': done,
+            'top': [(title, count, likes[title])
+                    for title, count in mentions.most_common(self.top_n)]
+        }
+
+    def run(self, pages):
+        """Yield leaderboard snapshots while pages are processed
+
+        pages is any iterable of post lists, e.g. fetch_pages(). Each
+        snapshot has the posts and matched posts so far, the elapsed
+        seconds and the top (title, mentions, likes); the last one has
+        done=True. With an aggregation_store, matched titles are added to
+        it at every snapshot.
+        """
+        self._stop.clear()
+        queues = [queue.Queue(self.queue_size) for _ in range(4)]
+        threads = [threading.Thread(target=self._feed, args=(pages, queues[0]), daemon=True)]
+        for func, in_q, out_q in zip((self.simplify, self.clean, self.extract),
+                                     queues, queues[1:]):
+            threads.append(threading.Thread(
+                target=self._stage, args=(func, in_q, out_q), daemon=True))
+        for thread in threads:
+            thread.start()
+
+        mentions, likes = Counter(), Counter()
+        pending = []  # mentions not yet in the aggregation store
+        posts = matched = since_emit = 0
+        start = time.perf_counter()
+        last_emit = start - self.emit_interval  # first post is reported at once
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _StageError):
+                    raise item.error
+                posts += 1
+                since_emit += 1
+                if item['titles']:
+                    matched += 1
+                    mentions.update(item['titles'])
+                    for title in item['titles']:
+                        likes[title] += item.get('like_count') or 0
+                        # Stored under the dump's spelling, as add_results does
+                        pending.append((self.analyzer.known_games.get(title, title), title,
+                                        item['uri'], item.get('created_at'),
+                                        item.get('like_count')))
+                now = time.perf_counter()
+                if since_emit >= self.emit_every or now - last_emit >= self.emit_interval:
+                    self._flush(pending)
+                    yield self._snapshot(mentions, likes, posts, matched, start, False)
+                    since_emit, last_emit = 0, now
+            self._flush(pending)
+            yield self._snapshot(mentions, likes, posts, matched, start, True)
+        finally:
+            # Also reached when the consumer stops early: every thread
+            # waiting on a queue gives up within 0.1s
+            self._stop.set()
+
+    def fetch_pages(self, fetcher, hashtag, windows, state=None):
+        """Run an AsyncBskyFetcher crawl in a thread, yielding its pages
+
+        Pages wait in a bounded queue, so the crawl slows down when the
+        pipeline falls behind.
+        """
+        pages = queue.Queue(self.queue_size)
+        failures = {}
+
+        async def on_page(label, posts):
+            if posts and not await asyncio.to_thread(self._put, pages, posts):
+                raise asyncio.CancelledError()
+
+        def crawl():
+            try:
+                failures.update(asyncio.run(
+                    fetcher.crawl(hashtag, windows, on_page, state=state)))
+            except Exception as e:
+                self._put(pages, _StageError(e))
+            self._put(pages, _DONE)
+
+        threading.Thread(target=crawl, daemon=True).start()
+        while True:
+            # A stopped pipeline may never get _DONE from the crawl thread
+            page = self._get(pages)
+            if page is _DONE:
+                break
+            if isinstance(page, _StageError):
+                raise page.error
+            yield page
+        self.fetch_failures = failures
@@ -0,0 +1,64 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # optional, json is used instead
+    orjson = None
+
+
+class PostRecord:
+    """Compact post with only the fields DataManager saves
+
+    Built straight from the XRPC JSON, so author avatars, viewer state and
+    nested embeds are dropped as soon as a page is parsed instead of living
+    on in PostView models.
+    """
+
+    __slots__ = ('uri', 'handle', 'created_at', 'text', 'tags', 'like_count',
+                 'image_alts', 'indexed_at')
+    FIELDS = ('uri', 'handle', 'created_at', 'text', 'tags', 'like_count', 'image_alts')
+
+    def __init__(self, uri, handle, created_at, text, tags, like_count,
+                 image_alts, indexed_at=None):
+        self.uri = uri
+        self.handle = handle
+        self.created_at = created_at
+        self.text = text
+        self.tags = tags
+        self.like_count = like_count
+        self.image_alts = image_alts
+        self.indexed_at = indexed_at
+
+    @classmethod
+    def from_post(cls, post):
+        """Record from a raw searchPosts post dict (same fields as simplify_post)"""
+        record = post.get('record', {})
+        tags = [feature['tag']
+                for facet in record.get('facets') or ()
+                for feature in facet.get('features', ())
+                if 'tag' in feature]
+        media = (post.get('embed') or {}).get('media') or {}
+        image_alts = [img.get('alt', '') for img in media.get('images', ())]
+        return cls(
+            post['uri'],
+            post['author']['handle'],
+            record.get('createdAt'),
+            record.get('text', ''),
+            tags,
+            post.get('likeCount', 0),
+            image_alts,
+            post.get('indexedAt')
+        )
+
+    def to_dict(self):
+        """The dict save_raw_json/append_jsonl write for this post"""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self):
+        return f"PostRecord({self.uri!r}, {self.handle!r})"
+
+
+def parse_search_page(content):
+    """(records, cursor) from the raw bytes of a searchPosts response"""
+    page = orjson.loads(content) if orjson is not None else json.loads(content)
+    return [PostRecord.from_post(post) for post in page.get('posts') or ()], page.get('cursor')
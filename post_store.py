@@ -0,0 +1,128 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+
+class PostStore:
+    """SQLite store of simplified posts, one row per AT URI
+
+    Overlapping crawls and reruns upsert the same posts again; only new
+    URIs add rows and a changed like_count is refreshed in place (as is a
+    missing handle, for posts first seen on the firehose), so the
+    store (and everything analysed from it) grows with unique posts rather
+    than with crawl volume.
+    """
+
+    COLUMNS = ('uri', 'handle', 'created_at', 'text', 'tags', 'like_count', 'image_alts')
+    INSERT = ("INSERT OR IGNORE INTO posts (uri, handle, created_at, text, tags, "
+              "like_count, image_alts, first_seen, updated_at) "
+              "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+    UPDATE = ("UPDATE posts SET like_count = ?, handle = COALESCE(handle, ?), "
+              "updated_at = ? WHERE uri = ? "
+              "AND (like_count != ? OR (handle IS NULL AND ? IS NOT NULL))")
+
+    def __init__(self, path="./data/posts.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS posts ("
+            "uri TEXT PRIMARY KEY, handle TEXT, created_at TEXT, text TEXT, "
+            "tags TEXT, like_count INTEGER DEFAULT 0, image_alts TEXT, "
+            "first_seen REAL, updated_at REAL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS posts_handle ON posts(handle)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS posts_created_at ON posts(created_at)")
+        self.conn.commit()
+
+    @staticmethod
+    def _row(post, now):
+        return (
+            post['uri'],
+            post.get('handle'),
+            post.get('created_at'),
+            post.get('text', ''),
+            json.dumps(post.get('tags') or [], ensure_ascii=False),
+            post.get('like_count') or 0,
+            json.dumps(post.get('image_alts') or [], ensure_ascii=False),
+            now, now
+        )
+
+    @staticmethod
+    def _update(row, now):
+        uri, handle, like_count = row[0], row[1], row[5]
+        return like_count, handle, now, uri, like_count, handle
+
+    def upsert(self, posts):
+        """Insert new posts and refresh like counts and missing handles
+
+        Returns (inserted, updated).
+        """
+        now = time.time()
+        rows = [self._row(post, now) for post in posts]
+        if not rows:
+            return 0, 0
+
+        with self._lock:
+            inserted = self.conn.executemany(self.INSERT, rows).rowcount
+            updated = self.conn.executemany(
+                self.UPDATE, [self._update(row, now) for row in rows]).rowcount
+            self.conn.commit()
+        return inserted, updated
+
+    def _select(self, where='', params=()):
+        with self._lock:
+            cursor = self.conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM posts {where}", params)
+            rows = cursor.fetchall()
+        posts = []
+        for row in rows:
+            post = dict(zip(self.COLUMNS, row))
+            post['tags'] = json.loads(post['tags'] or '[]')
+            post['image_alts'] = json.loads(post['image_alts'] or '[]')
+            posts.append(post)
+        return posts
+
+    def get(self, uri):
+        """The post with this URI as a dict, or None"""
+        posts = self._select("WHERE uri = ?", (uri,))
+        return posts[0] if posts else None
+
+    def by_handle(self, handle):
+        """Every post by one author, oldest first"""
+        return self._select("WHERE handle = ? ORDER BY created_at", (handle,))
+
+    def in_range(self, start=None, end=None):
+        """Posts created in [start, end), oldest first
+
+        start and end are ISO strings, e.g. '2024-05-01' or
+        '2024-05-01T12:00:00Z'; either may be omitted.
+        """
+        conditions, params = [], []
+        if start:
+            conditions.append("created_at >= ?")
+            params.append(start)
+        if end:
+            conditions.append("created_at < ?")
+            params.append(end)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ''
+        return self._select(where + "ORDER BY created_at", params)
+
+    def to_pandas(self, start=None, end=None):
+        """Posts in [start, end) as a DataFrame with the load_to_pandas columns"""
+        return pd.DataFrame.from_records(
+            self.in_range(start, end), columns=list(self.COLUMNS))
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
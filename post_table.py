@@ -0,0 +1,156 @@
+from array import array
+
+import numpy as np
+import pandas as pd
+
+
+class PostTable:
+    """Column-oriented in-memory posts backed by flat arrays
+
+    Strings (uri, created_at, text, image alts) are stored as one UTF-8
+    buffer plus int64 offsets, handles and tags are dictionary-encoded
+    into int32 codes, list columns use per-post offsets and like counts
+    are int32. This avoids a Python object per value, which is what makes
+    object-dtype DataFrames large at millions of posts; values are only
+    decoded when a column is iterated.
+    """
+
+    STRING_COLUMNS = ('uri', 'created_at', 'text')
+    COLUMNS = ('uri', 'handle', 'created_at', 'text', 'tags', 'like_count', 'image_alts')
+
+    def __init__(self, strings, handle_codes, handles, tag_offsets, tag_codes,
+                 tags, alt_offsets, alts, like_count):
+        self._strings = strings  # name -> (int64 offsets, utf-8 bytes)
+        self.handle_codes = handle_codes
+        self.handles = handles
+        self.tag_offsets = tag_offsets
+        self.tag_codes = tag_codes
+        self.tags = tags
+        self.alt_offsets = alt_offsets  # post -> range of alts
+        self._alts = alts  # (int64 offsets, utf-8 bytes) of every alt text
+        self.like_count = like_count
+
+    @classmethod
+    def from_posts(cls, posts):
+        """Build a table from simplified post dicts or PostRecords"""
+        buffers = {name: (bytearray(), array('q', [0])) for name in cls.STRING_COLUMNS}
+        handle_ids, handle_codes = {}, array('i')
+        tag_ids, tag_codes, tag_offsets = {}, array('i'), array('q', [0])
+        alt_data, alt_ends, alt_offsets = bytearray(), array('q', [0]), array('q', [0])
+        likes = array('i')
+
+        for post in posts:
+            if not isinstance(post, dict):
+                post = post.to_dict()
+            for name, (data, offsets) in buffers.items():
+                value = post.get(name)
+                if isinstance(value, str):
+                    data += value.encode('utf-8')
+                offsets.append(len(data))
+
+            handle = post.get('handle') or ''
+            handle_codes.append(handle_ids.setdefault(handle, len(handle_ids)))
+
+            tags = post.get('tags')
+            for tag in tags if isinstance(tags, (list, tuple)) else ():
+                tag_codes.append(tag_ids.setdefault(tag, len(tag_ids)))
+            tag_offsets.append(len(tag_codes))
+
+            alts = post.get('image_alts')
+            for alt in alts if isinstance(alts, (list, tuple)) else ():
+                alt_data += (alt or '').encode('utf-8')
+                alt_ends.append(len(alt_data))
+            alt_offsets.append(len(alt_ends) - 1)
+
+            like_count = post.get('like_count')
+            likes.append(int(like_count) if like_count == like_count and like_count else 0)
+
+        return cls(
+            {name: (np.frombuffer(offsets, dtype=np.int64), bytes(data))
+             for name, (data, offsets) in buffers.items()},
+            np.frombuffer(handle_codes, dtype=np.int32), list(handle_ids),
+            np.frombuffer(tag_offsets, dtype=np.int64),
+            np.frombuffer(tag_codes, dtype=np.int32), list(tag_ids),
+            np.frombuffer(alt_offsets, dtype=np.int64),
+            (np.frombuffer(alt_ends, dtype=np.int64), bytes(alt_data)),
+            np.frombuffer(likes, dtype=np.int32)
+        )
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Build a table from a load_to_pandas style DataFrame"""
+        columns = [name for name in cls.COLUMNS if name in df.columns]
+        return cls.from_posts(
+            dict(zip(columns, values))
+            for values in zip(*(df[name] for name in columns)))
+
+    def __len__(self):
+        return len(self.like_count)
+
+    @staticmethod
+    def _decode(offsets, data):
+        offsets = offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield data[start:end].decode('utf-8')
+
+    def iter_column(self, name):
+        """Yield one column's values post by post, decoding as it goes"""
+        if name in self._strings:
+            yield from self._decode(*self._strings[name])
+        elif name == 'handle':
+            handles = self.handles
+            for code in self.handle_codes.tolist():
+                yield handles[code]
+        elif name == 'tags':
+            tags, codes = self.tags, self.tag_codes.tolist()
+            offsets = self.tag_offsets.tolist()
+            for start, end in zip(offsets, offsets[1:]):
+                yield [tags[code] for code in codes[start:end]]
+        elif name == 'image_alts':
+            alts = list(self._decode(*self._alts))
+            offsets = self.alt_offsets.tolist()
+            for start, end in zip(offsets, offsets[1:]):
+                yield alts[start:end]
+        elif name == 'like_count':
+            yield from self.like_count.tolist()
+        else:
+            raise KeyError(name)
+
+    def row(self, i):
+        """One post as a simplified post dict"""
+        post = {}
+        for name in self.STRING_COLUMNS:
+            offsets, data = self._strings[name]
+            post[name] = data[offsets[i]:offsets[i + 1]].decode('utf-8')
+        alt_ends, alt_data = self._alts
+        post.update({
+            'handle': self.handles[self.handle_codes[i]],
+            'tags': [self.tags[code]
+                     for code in self.tag_codes[self.tag_offsets[i]:self.tag_offsets[i + 1]]],
+            'like_count': int(self.like_count[i]),
+            'image_alts': [alt_data[alt_ends[j]:alt_ends[j + 1]].decode('utf-8')
+                           for j in range(self.alt_offsets[i], self.alt_offsets[i + 1])]
+        })
+        return {name: post[name] for name in self.COLUMNS}
+
+    def to_pandas(self, columns=None):
+        """DataFrame of the given columns (all by default)"""
+        frame = {}
+        for name in columns or self.COLUMNS:
+            if name == 'like_count':
+                frame[name] = self.like_count
+            elif name == 'handle':
+                frame[name] = pd.Categorical.from_codes(self.handle_codes, self.handles)
+            else:
+                frame[name] = list(self.iter_column(name))
+        return pd.DataFrame(frame)
+
+    def nbytes(self):
+        """Approximate memory held by the table"""
+        total = sum(offsets.nbytes + len(data) for offsets, data in self._strings.values())
+        total += sum(len(value.encode('utf-8')) + 49 for value in self.handles + self.tags)
+        total += self._alts[0].nbytes + len(self._alts[1])
+        for column in (self.handle_codes, self.tag_offsets, self.tag_codes,
+                       self.alt_offsets, self.like_count):
+            total += column.nbytes
+        return total
@@ -0,0 +1,123 @@
+import asyncio
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    """Token-bucket rate limiter shared by every Bluesky API caller
+
+    Callers reserve a token before each request; when the bucket is empty
+    the reservation tells them how long to wait, so concurrent callers
+    queue up instead of bursting. The rate never exceeds the configured
+    one but is lowered to what the server's RateLimit-* headers allow, and
+    429/5xx responses pause the whole bucket with exponential backoff and
+    full jitter.
+    """
+
+    def __init__(self, rate=5.0, capacity=None, base_delay=1.0, max_delay=60.0):
+        self.max_rate = rate  # configured requests per second
+        self.rate = rate  # current rate, lowered by server headers
+        self.capacity = capacity or max(1.0, rate)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.tokens = self.capacity
+        self.blocked_until = 0.0  # monotonic time the server asked us to wait for
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token, return how many seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= 1
+            # Tokens are spaced out from the end of a server-imposed pause,
+            # so callers queued during it do not all go when it ends
+            return max(self.blocked_until - now, 0.0) + max(0.0, -self.tokens / self.rate)
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request may be sent"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    @staticmethod
+    def _header(headers, name):
+        for key, value in (headers or {}).items():
+            if key.lower() == name:
+                return value
+        return None
+
+    def update_from_headers(self, headers):
+        """Adapt to RateLimit-Limit/Remaining/Reset response headers
+
+        Bluesky sends the remaining requests in the current window and the
+        window reset as a Unix timestamp.
+        """
+        remaining = self._header(headers, 'ratelimit-remaining')
+        reset = self._header(headers, 'ratelimit-reset')
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining = int(remaining)
+            seconds_left = max(float(reset) - time.time(), 0.0)
+        except ValueError:
+            return
+
+        with self._lock:
+            if remaining <= 0:
+                self.blocked_until = max(
+                    self.blocked_until, time.monotonic() + seconds_left)
+            elif seconds_left > 0:
+                self.rate = min(self.max_rate, remaining / seconds_left)
+            else:
+                self.rate = self.max_rate
+
+    def backoff(self, attempt, headers=None):
+        """Pause the bucket after a 429/5xx, return the delay chosen
+
+        The delay is drawn uniformly up to base_delay * 2**attempt (capped
+        at max_delay) but never shorter than the server's Retry-After.
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        retry_after = self._header(headers, 'retry-after')
+        if retry_after is not None:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        self.update_from_headers(headers)
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+        return delay
+
+    @staticmethod
+    def is_retryable(status_code):
+        return status_code == 429 or (status_code is not None and status_code >= 500)
+
+    def call(self, func, *args, max_retries=5, **kwargs):
+        """Call func under the limiter, retrying on rate-limit/server errors
+
+        Meant for atproto Client methods, which raise on non-200 responses
+        with the HTTP response attached to the exception.
+        """
+        for attempt in range(max_retries + 1):
+            self.acquire()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                response = getattr(e, 'response', None)
+                status_code = getattr(response, 'status_code', None)
+                if attempt == max_retries or not self.is_retryable(status_code):
+                    raise
+                delay = self.backoff(attempt, getattr(response, 'headers', None))
+                print(f"Request failed with {status_code}, retrying in {delay:.1f}s")
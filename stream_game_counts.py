@@ -0,0 +1,33 @@
+import os
+from aggregation_store import AggregationStore
+from bsky_fetcher import AsyncBskyFetcher
+from crawl_state import CrawlStateStore
+from datetime import datetime
+from pipeline import StreamingPipeline
+from post_store import PostStore
+
+# Fetch, analyse and count in one pass: the leaderboard is printed while
+# the crawl is still running. Credentials come from BSKY_HANDLE and
+# BSKY_PASSWORD.
+fetcher = AsyncBskyFetcher(max_concurrency=4)
+fetcher.login(os.environ['BSKY_HANDLE'], os.environ['BSKY_PASSWORD'])
+
+aggregates = AggregationStore()
+pipeline = StreamingPipeline(post_store=PostStore(), aggregation_store=aggregates)
+windows = AsyncBskyFetcher.day_windows(datetime(2024, 5, 1), 31)
+pages = pipeline.fetch_pages(fetcher, "gamechallenge", windows, state=CrawlStateStore())
+
+for snapshot in pipeline.run(pages):
+    print(f"\n{snapshot['posts']} posts, {snapshot['matched']} with games "
+          f"({snapshot['seconds']:.0f}s)")
+    for title, mentions, likes in snapshot['top'][:10]:
+        print(f"  {title}: {mentions} mentions, {likes} likes")
+
+# Posts were added to the stored per-day counts (each post once), so the
+# all-time leaderboard includes earlier runs too
+print("\nAll runs:")
+for game in aggregates.top(10):
+    print(f"  {game['canonical']}: {game['mentions']} mentions, {game['total_likes']} likes")
+
+if pipeline.fetch_failures:
+    print(f"{len(pipeline.fetch_failures)} days failed, rerun to resume them")
@@ -0,0 +1,84 @@
+import re
+import string
+
+import pandas as pd
+
+# What Python's \s matches in ASCII (str.isspace), and the ASCII \w set
+ASCII_SPACE = ' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+ASCII_WORD = string.ascii_letters + string.digits + '_'
+
+
+def _deleted_bytes(kept):
+    kept = set(kept.encode('ascii'))
+    return bytes(byte for byte in range(128) if byte not in kept)
+
+
+class TextCleaner:
+    """Precompiled post cleaners shared by GameAnalyzer and GameAnalyzerText
+
+    Character filtering on ASCII-only posts (most of them) is a single
+    bytes.translate deletion; other posts use the equivalent regex. URLs,
+    mentions and hashtags are removed by one regex only when the post
+    contains them, and boilerplate phrases are replaced (in any case) only
+    when present. Otherwise results are identical to the regex-only
+    cleaners this replaces.
+    """
+
+    # Longest first: the first phrase contains the second
+    MASK_PHRASES = [
+        "The challenge is to choose 20 games that greatly influenced you.",
+        "Choose 20 games that greatly influenced you.",
+        "One game per day, for 20 days.",
+        "No explanations, no reviews, no particular order."
+    ]
+
+    LLM_TOKENS = re.compile(r'http\S+|[@#]\w+')
+    LLM_PATTERN = re.compile(r'http\S+|[@#]\w+|[^\w\s]')
+    LLM_DELETE = _deleted_bytes(ASCII_WORD + ASCII_SPACE)
+    MATCHING_PATTERN = re.compile(r'[^\w\s:,]')
+    MATCHING_DELETE = _deleted_bytes(ASCII_WORD + ASCII_SPACE + ':,')
+
+    def __init__(self, mask_phrases=None):
+        self.mask_phrases = list(self.MASK_PHRASES if mask_phrases is None else mask_phrases)
+        self._masks = [(phrase.lower(), re.compile(re.escape(phrase), re.IGNORECASE))
+                       for phrase in self.mask_phrases]
+
+    def strip_mask_phrases(self, text):
+        """Remove the challenge boilerplate sentences, whatever their case"""
+        lowered = text.lower()
+        for phrase, pattern in self._masks:
+            if phrase in lowered:
+                text = pattern.sub('', text)
+                lowered = text.lower()
+        return text
+
+    def clean_for_llm(self, text):
+        """Lowercase and drop URLs, mentions, hashtags and punctuation"""
+        text = text.lower()
+        if not text.isascii():
+            return self.LLM_PATTERN.sub('', text)
+        # Tokens first, then single characters: same result as one
+        # left-to-right pass of LLM_PATTERN, since neither step can create
+        # a match for the other
+        if 'http' in text or '#' in text or '@' in text:
+            text = self.LLM_TOKENS.sub('', text)
+        return text.encode('ascii').translate(None, self.LLM_DELETE).decode('ascii')
+
+    def clean_for_matching(self, text):
+        """Drop boilerplate and punctuation except : and ,, lowercase and strip"""
+        text = self.strip_mask_phrases(text)
+        if text.isascii():
+            text = text.encode('ascii').translate(None, self.MATCHING_DELETE).decode('ascii')
+        else:
+            text = self.MATCHING_PATTERN.sub('', text)
+        return text.lower().strip()
+
+    def clean_for_llm_series(self, texts):
+        """clean_for_llm over a Series of texts"""
+        clean = self.clean_for_llm
+        return pd.Series([clean(text) for text in texts.tolist()], index=texts.index)
+
+    def clean_for_matching_series(self, texts):
+        """clean_for_matching over a Series of texts"""
+        clean = self.clean_for_matching
+        return pd.Series([clean(text) for text in texts.tolist()], index=texts.index)
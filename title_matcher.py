@@ -0,0 +1,139 @@
+import re
+from array import array
+from collections import deque
+
+
+class TitleMatcher:
+    """Aho-Corasick automaton over known game titles
+
+    Titles are matched on word boundaries: both titles and post text are
+    split into word tokens, so the automaton's alphabet is the title
+    vocabulary rather than characters, which keeps it small enough for the
+    full TextDump_GameOnly.txt list. find_all() scans a text once and
+    returns the leftmost-longest, non-overlapping title occurrences,
+    optionally vetted by the caller.
+    """
+
+    TOKEN_PATTERN = re.compile(r'\w+')
+    VERSION = 1  # bump when the automaton's layout changes (invalidates caches)
+    _SHIFT = 22  # token ids live in the low bits of a transition key
+
+    def __init__(self, titles, min_tokens=2, excluded=()):
+        self.vocab = {}
+        self.titles = []
+        self._goto = {}
+        self._fail = array('i', [0])
+        self._output = array('i', [-1])  # title index ending at this state
+        self._dict_link = array('i', [0])  # next output state on fail chain
+        self._depth = array('i', [0])
+
+        excluded = set(excluded)
+        children = [[]]
+        for title in titles:
+            tokens = self.tokenize(title)
+            if len(tokens) < min_tokens or title.lower() in excluded:
+                continue
+            state = 0
+            for token in tokens:
+                token_id = self.vocab.setdefault(token, len(self.vocab))
+                key = (state << self._SHIFT) | token_id
+                child = self._goto.get(key)
+                if child is None:
+                    child = len(self._fail)
+                    self._goto[key] = child
+                    self._fail.append(0)
+                    self._output.append(-1)
+                    self._dict_link.append(0)
+                    self._depth.append(self._depth[state] + 1)
+                    children.append([])
+                    children[state].append((token_id, child))
+                state = child
+            if self._output[state] == -1:
+                self._output[state] = len(self.titles)
+                self.titles.append(title)
+
+        if len(self.vocab) >= 1 << self._SHIFT:
+            raise ValueError("Title vocabulary too large for TitleMatcher")
+        self._build_links(children)
+
+    def _build_links(self, children):
+        """Breadth-first pass computing failure and dictionary links"""
+        queue = deque(child for _, child in children[0])
+        while queue:
+            state = queue.popleft()
+            for token_id, child in children[state]:
+                queue.append(child)
+                fallback = self._fail[state]
+                while True:
+                    target = self._goto.get((fallback << self._SHIFT) | token_id)
+                    if target is not None or fallback == 0:
+                        break
+                    fallback = self._fail[fallback]
+                fail = target if target is not None and target != child else 0
+                self._fail[child] = fail
+                self._dict_link[child] = (
+                    fail if self._output[fail] != -1 else self._dict_link[fail])
+
+    @classmethod
+    def tokenize(cls, text):
+        return cls.TOKEN_PATTERN.findall(text.lower())
+
+    def __len__(self):
+        return len(self.titles)
+
+    def iter_matches(self, text):
+        """Yield every (start_token, n_tokens, title) occurrence in text"""
+        return self._matches(self.tokenize(text))
+
+    def _matches(self, tokens):
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        dict_link = self._dict_link
+        depth = self._depth
+        vocab = self.vocab
+        shift = self._SHIFT
+
+        state = 0
+        for position, token in enumerate(tokens):
+            token_id = vocab.get(token)
+            if token_id is None:
+                state = 0  # token appears in no title
+                continue
+            while True:
+                target = goto.get((state << shift) | token_id)
+                if target is not None or state == 0:
+                    break
+                state = fail[state]
+            state = target if target is not None else 0
+
+            match = state if output[state] != -1 else dict_link[state]
+            while match:
+                yield (position - depth[match] + 1, depth[match],
+                       self.titles[output[match]])
+                match = dict_link[match]
+
+    def find_all(self, text, accept=None):
+        """Return titles found in text, preferring the longest match
+
+        accept(text, start, end), when given, vets each occurrence by its
+        character span in text; rejected ones do not block shorter matches.
+        """
+        if accept is None:
+            matches = self.iter_matches(text)
+        else:
+            spans = [match.span() for match in self.TOKEN_PATTERN.finditer(text)]
+            tokens = [text[start:end].lower() for start, end in spans]
+            matches = [
+                (start, length, title)
+                for start, length, title in self._matches(tokens)
+                if accept(text, spans[start][0], spans[start + length - 1][1])
+            ]
+        matches = sorted(matches, key=lambda m: (m[0], -m[1]))
+        found = []
+        next_free = 0
+        for start, length, title in matches:
+            if start >= next_free:
+                found.append(title)
+                next_free = start + length
+        return found
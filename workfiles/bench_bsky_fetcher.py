@@ -0,0 +1,51 @@
+# Run from the repo root: python -m workfiles.bench_bsky_fetcher
+import asyncio
+import glob
+import os
+import tempfile
+from datetime import datetime
+
+from bsky_fetcher import AsyncBskyFetcher, JsonlPageSink
+from data_manager import DataManager
+from rate_limiter import TokenBucket
+from workfiles.mock_xrpc_server import start_mock_xrpc
+
+
+def peak_rate(times, window=1.0):
+    """Most requests seen in any window-second span (half-open)"""
+    peak, first = 0, 0
+    for last, t in enumerate(times):
+        while t - times[first] >= window:
+            first += 1
+        peak = max(peak, last - first + 1)
+    return peak / window
+
+
+def run(days=31, posts_per_window=250, concurrency_levels=(1, 4, 8), rate=20.0):
+    server, base_url = start_mock_xrpc(posts_per_window=posts_per_window)
+    windows = AsyncBskyFetcher.day_windows(datetime(2024, 12, 1), days)
+    try:
+        for concurrency in concurrency_levels:
+            server.handler.request_times.clear()
+            with tempfile.TemporaryDirectory() as data_dir:
+                fetcher = AsyncBskyFetcher(
+                    base_url=base_url, max_concurrency=concurrency,
+                    rate_limiter=TokenBucket(rate=rate, capacity=1, base_delay=0.1))
+                sink = JsonlPageSink(DataManager(data_dir), "gamechallenge")
+                failures = asyncio.run(
+                    fetcher.crawl("gamechallenge", windows, sink))
+
+                files = glob.glob(os.path.join(data_dir, "*.jsonl"))
+                lines = sum(sum(1 for _ in open(f)) for f in files)
+                assert not failures and lines == days * posts_per_window, (failures, lines)
+                fixed_sleep = fetcher.stats['requests'] * 15
+                print(f"concurrency={concurrency:2d}  {fetcher.stats['seconds']:6.2f}s  "
+                      f"{len(files)} files, {lines} posts  "
+                      f"peak {peak_rate(server.handler.request_times):.0f} req/s "
+                      f"(limit {rate:.0f})  15s-sleep estimate {fixed_sleep}s")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,41 @@
+# Run from the repo root:
+#   python -m workfiles.bench_firehose_replay record capture.pkl.gz 60
+#   python -m workfiles.bench_firehose_replay replay capture.pkl.gz
+import asyncio
+import os
+import sys
+import tempfile
+
+from firehose_ingest import FirehoseCapture, FirehoseIngestor
+from post_store import PostStore
+
+# Commits per second on the whole network at peak, the rate to keep up with
+NETWORK_COMMIT_RATE = 2000
+
+
+async def record(path, seconds):
+    capture = FirehoseCapture(path)
+    with tempfile.TemporaryDirectory() as tmp:
+        ingestor = FirehoseIngestor(PostStore(os.path.join(tmp, 'posts.sqlite')))
+        try:
+            await asyncio.wait_for(ingestor.run(recorder=capture), seconds)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            capture.close()
+    print(f"Recorded {capture.frames} frames to {path}")
+
+
+def replay(path):
+    with tempfile.TemporaryDirectory() as tmp:
+        ingestor = FirehoseIngestor(PostStore(os.path.join(tmp, 'posts.sqlite')))
+        rate = ingestor.replay(path)
+    print(f"{rate / NETWORK_COMMIT_RATE:.1f}x the network commit rate on one core")
+
+
+if __name__ == '__main__':
+    mode, path = sys.argv[1], sys.argv[2]
+    if mode == 'record':
+        asyncio.run(record(path, float(sys.argv[3]) if len(sys.argv) > 3 else 60))
+    else:
+        replay(path)
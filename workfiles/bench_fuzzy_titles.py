@@ -0,0 +1,56 @@
+# Run from the repo root: python -m workfiles.bench_fuzzy_titles
+import random
+import time
+
+from fuzzy_titles import FuzzyTitleResolver
+from known_games_index import KnownGamesIndex
+
+# The kinds of misspelled, shortened and abbreviated titles posts contain
+EXAMPLES = [
+    ("Ocarina of Tim", "The Legend of Zelda: Ocarina of Time"),
+    ("Zelda OOT", "The Legend of Zelda: Ocarina of Time"),
+    ("Zelda: Ocarina of Time", "The Legend of Zelda: Ocarina of Time"),
+    ("Fabel II", "Fable II"),
+]
+MIN_CONFIDENCE = 0.8
+
+
+def add_typo(title, rng):
+    """Delete, swap or replace one character"""
+    i = rng.randrange(len(title))
+    action = rng.choice(('delete', 'swap', 'replace'))
+    if action == 'delete':
+        return title[:i] + title[i + 1:]
+    if action == 'swap' and i + 1 < len(title):
+        return title[:i] + title[i + 1] + title[i] + title[i + 2:]
+    return title[:i] + rng.choice('abcdefghijklmnopqrstuvwxyz') + title[i + 1:]
+
+
+def run(n_queries=2000, seed=0):
+    index = KnownGamesIndex.load_or_build()
+    start = time.perf_counter()
+    resolver = FuzzyTitleResolver(index.values())
+    print(f"Index built in {time.perf_counter() - start:.2f}s "
+          f"({len(resolver.titles)} titles)")
+
+    rng = random.Random(seed)
+    targets = rng.sample([t for t in resolver.titles if len(t) >= 8], n_queries)
+    queries = [add_typo(title, rng) for title in targets]
+
+    start = time.perf_counter()
+    results = [resolver.resolve(query) for query in queries]
+    elapsed = time.perf_counter() - start
+
+    correct = sum(1 for (title, _), target in zip(results, targets)
+                  if title == target)
+    print(f"{elapsed / n_queries * 1000:.3f} ms per lookup, "
+          f"{correct}/{n_queries} typos resolved to the original title")
+
+    for query, expected in EXAMPLES:
+        title, confidence = resolver.resolve(query)
+        ok = title == expected and confidence >= MIN_CONFIDENCE
+        print(f"{'ok  ' if ok else 'FAIL'} {query!r} -> {title!r} ({confidence:.2f})")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,76 @@
+# Run from the repo root: python -m workfiles.bench_group_titles
+import random
+import time
+
+import pandas as pd
+
+from game_analyzer import GameAnalyzer
+
+
+def legacy_group_similar_titles(analyzer, df):
+    """Row-by-row implementation group_similar_titles replaced"""
+    title_groups = {}
+    for idx, row in df.iterrows():
+        title = row['game_title']
+        if title and title.lower() != 'none':
+            norm_title = analyzer.normalize_title(title)
+            if norm_title in title_groups:
+                title_groups[norm_title]['mentions'] += 1
+                title_groups[norm_title]['total_likes'] += row['like_count']
+                title_groups[norm_title]['variants'].add(title)
+                title_groups[norm_title]['uris'].append(row['uri'])
+            else:
+                title_groups[norm_title] = {
+                    'canonical': title,
+                    'mentions': 1,
+                    'total_likes': row['like_count'],
+                    'variants': {title},
+                    'uris': [row['uri']]
+                }
+
+    df['mentions'] = df['game_title'].apply(
+        lambda x: title_groups.get(
+            analyzer.normalize_title(x), {}).get('mentions', 0)
+        if x and x.lower() != 'none' else 0)
+    df['total_likes'] = df['game_title'].apply(
+        lambda x: title_groups.get(
+            analyzer.normalize_title(x), {}).get('total_likes', 0)
+        if x and x.lower() != 'none' else 0)
+    df['all_uris'] = df['game_title'].apply(
+        lambda x: ' - '.join(title_groups.get(
+            analyzer.normalize_title(x), {}).get('uris', []))
+        if x and x.lower() != 'none' else '')
+    return df, title_groups
+
+
+def make_results(n_rows, n_titles=2000, seed=0):
+    rng = random.Random(seed)
+    titles = [f"Game {i}" for i in range(n_titles)] + ['None']
+    return pd.DataFrame({
+        'uri': [f"at://did:plc:bench/app.bsky.feed.post/{i}" for i in range(n_rows)],
+        'game_title': [rng.choice(titles) for _ in range(n_rows)],
+        'like_count': [rng.randint(0, 50) for _ in range(n_rows)]
+    })
+
+
+def run(sizes=(100_000, 1_000_000)):
+    analyzer = GameAnalyzer()
+    columns = ['mentions', 'total_likes', 'all_uris']
+    for n_rows in sizes:
+        df = make_results(n_rows)
+
+        start = time.perf_counter()
+        legacy, _ = legacy_group_similar_titles(analyzer, df.copy())
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        grouped, _ = analyzer.group_similar_titles(df.copy())
+        grouped_time = time.perf_counter() - start
+
+        pd.testing.assert_frame_equal(legacy[columns], grouped[columns])
+        print(f"{n_rows:>9,d} rows  legacy {legacy_time:7.2f}s  "
+              f"groupby {grouped_time:6.2f}s  x{legacy_time / grouped_time:.1f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,51 @@
+# Run from the repo root: python -m workfiles.bench_jsonl_roundtrip
+import tempfile
+import time
+
+from data_manager import DataManager, _read_posts
+
+APPENDS = 50  # pages appended to one day file, as JsonlPageSink does
+POSTS_PER_APPEND = 100
+
+
+def synthetic_page(page):
+    return [{
+        'uri': f"at://did:plc:{page:03d}{i:05d}/app.bsky.feed.post/{i}",
+        'handle': f"user{i}.bsky.social",
+        'created_at': '2024-05-01T12:00:00.000Z',
+        'text': f"#GameChallenge Day {page}: game {i}",
+        'tags': ['GameChallenge'],
+        'like_count': i,
+        'image_alts': []
+    } for i in range(POSTS_PER_APPEND)]
+
+
+def main():
+    expected = APPENDS * POSTS_PER_APPEND
+    with tempfile.TemporaryDirectory() as base_path:
+        dm = DataManager(base_path)
+        for suffix in ('', '.gz', '.zst'):
+            filename = f"posts_gamechallenge_20240501.jsonl{suffix}"
+            try:
+                start = time.perf_counter()
+                for page in range(APPENDS):
+                    dm.append_jsonl(synthetic_page(page), filename,
+                                    mode='w' if page == 0 else 'a')
+                write_seconds = time.perf_counter() - start
+            except ImportError as e:
+                print(f"{filename}: skipped ({e})")
+                continue
+
+            start = time.perf_counter()
+            posts = _read_posts(f"{base_path}/{filename}")
+            chunked = sum(len(chunk) for chunk in dm.iter_jsonl_chunks(filename))
+            read_seconds = time.perf_counter() - start
+            # Every appended member/frame must be read back, not just the first
+            assert len(posts) == chunked == expected, (len(posts), chunked, expected)
+            assert posts[-1]['uri'] == synthetic_page(APPENDS - 1)[-1]['uri']
+            print(f"{filename}: {APPENDS} appends, {len(posts)}/{expected} posts "
+                  f"read back, write {write_seconds:.3f}s, read {read_seconds:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
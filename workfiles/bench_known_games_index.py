@@ -0,0 +1,91 @@
+# Run from the repo root: python -m workfiles.bench_known_games_index
+import glob
+import os
+import random
+import time
+import tracemalloc
+
+from game_analyzer_text import GameAnalyzerText
+from known_games_index import KnownGamesIndex
+from text_cleaner import TextCleaner
+
+
+def load_set(source):
+    with open(source, 'r', encoding='utf-8') as f:
+        return {game.strip().lower(): game.strip() for game in f.readlines()}
+
+
+def measure(label, loader):
+    tracemalloc.start()
+    start = time.perf_counter()
+    games = loader()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:10s} load {elapsed * 1000:9.2f} ms  peak {peak / 1e6:7.1f} MB")
+    return games
+
+
+def run(source='TextDump_GameOnly.txt', path='TextDump_GameOnly.idx', lookups=100000):
+    KnownGamesIndex.build(source, path)
+    in_memory = measure("dict", lambda: load_set(source))
+    index = measure("mmap index", lambda: KnownGamesIndex(path))
+
+    start = time.perf_counter()
+    index.get('')  # the first lookup builds the in-memory hash table
+    print(f"mmap index hash table built in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    probes = random.Random(0).sample(list(in_memory), 1000)
+    probes = (probes + [p + ' x' for p in probes]) * (lookups // 2000)
+    for label, games in (("dict", in_memory), ("mmap index", index)):
+        start = time.perf_counter()
+        hits = sum(1 for p in probes if p in games)
+        elapsed = time.perf_counter() - start
+        print(f"{label:10s} {len(probes) / elapsed:12.0f} lookups/sec ({hits} hits)")
+
+    print("prefix 'super mario':", index.keys_with_prefix('super mario', limit=5))
+
+
+def make_posts(titles, n, seed=0):
+    rng = random.Random(seed)
+    boilerplate = ' '.join(TextCleaner.MASK_PHRASES[:1])
+    posts = []
+    for i in range(n):
+        title = rng.choice(titles)
+        posts.append(rng.choice((
+            f"{boilerplate}\n\nDay {i % 20 + 1}: {title}\n\n#GameChallenge",
+            f"{boilerplate}\n\nDay {i % 20 + 1}\n\n{title}\n\n#GameChallenge #Games",
+            f"Still thinking about {title}, what a game. #GameChallenge",
+            "Loving this challenge, no idea what to pick today #GameChallenge")))
+    return posts
+
+
+def end_to_end(source='TextDump_GameOnly.txt', path='TextDump_GameOnly.idx', n_posts=20000):
+    """Analyzer start-up (titles and automaton) plus the per-post hot path"""
+    titles = list(load_set(source).values())
+    posts = make_posts(titles, n_posts)
+    for cache in glob.glob(f"{os.path.splitext(path)[0]}.*.idx"):
+        os.remove(cache)
+
+    runs = (("dict", lambda analyzer: setattr(analyzer, 'known_games', load_set(source))),
+            ("index, cold", lambda analyzer: None),
+            ("index, warm", lambda analyzer: None))
+    for label, setup in runs:
+        start = time.perf_counter()
+        analyzer = GameAnalyzerText()
+        setup(analyzer)
+        analyzer.title_matcher
+        ready = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for text in posts:
+            analyzer.extract_confident_title(text)
+            analyzer.match_titles(text)
+        hot = time.perf_counter() - start
+        print(f"{label:12s} ready in {ready:5.2f}s, {n_posts} posts in {hot:5.2f}s, "
+              f"total {ready + hot:5.2f}s")
+
+
+if __name__ == "__main__":
+    run()
+    end_to_end()
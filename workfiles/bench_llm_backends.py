@@ -0,0 +1,38 @@
+# Run from the repo root: python -m workfiles.bench_llm_backends
+from game_analyzer import GameAnalyzer
+from llm_backends import MockBackend, OllamaBackend, OpenAICompatibleBackend
+from workfiles.bench_llm_extraction import make_posts
+from workfiles.bench_llm_streaming import RAMBLE
+from workfiles.mock_ollama_server import start_mock_ollama
+
+
+def run(n_posts=100, latency=0.02, token_latency=0.002, workers=4):
+    # The same chatty model behind each backend; the in-process mock
+    # needs no server at all
+    server, url = start_mock_ollama(
+        latency=latency, token_latency=token_latency, ramble=RAMBLE)
+    backends = {
+        'mock': lambda: MockBackend(
+            latency=latency, token_latency=token_latency, ramble=RAMBLE),
+        'ollama': lambda: OllamaBackend(url=url),
+        'openai-compatible': lambda: OpenAICompatibleBackend(
+            url=url.replace('/api/generate', '/v1/chat/completions')),
+    }
+    try:
+        for name, make_backend in backends.items():
+            for stream in (False, True):
+                analyzer = GameAnalyzer(backend=make_backend(), stream=stream)
+                df = analyzer.extract_game_titles(make_posts(n_posts), max_workers=workers)
+                stats = analyzer.stats
+                clean = (df['developer'] == 'Lionhead Studios').mean()
+                print(f"{name:18s} stream={stream!s:5s} "
+                      f"{stats['posts_per_sec']:7.1f} posts/sec  "
+                      f"{stats['seconds_per_request'] * 1000:6.1f} ms/post  "
+                      f"{stats['tokens_per_request']:5.1f} tokens  {clean:.0%} clean")
+                analyzer.close()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    run()
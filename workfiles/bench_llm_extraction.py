@@ -0,0 +1,60 @@
+# Run from the repo root: python -m workfiles.bench_llm_extraction
+import json
+
+import pandas as pd
+
+from game_analyzer import GameAnalyzer
+from game_analyzer_text import GameAnalyzerText
+from llm_backends import MockBackend, OllamaBackend
+from post_record import PostRecord
+from workfiles.mock_ollama_server import start_mock_ollama
+
+
+def make_posts(n):
+    return pd.DataFrame({
+        'uri': [f"at://did:plc:bench/app.bsky.feed.post/{i}" for i in range(n)],
+        'text': [f"Day {i % 20 + 1:02d}: Fable II #GameChallenge" for i in range(n)],
+        'tags': [['GameChallenge']] * n,
+        'image_alts': [[]] * n,
+        'like_count': [i % 7 for i in range(n)]
+    })
+
+
+def run(n_posts=200, latency=0.05, worker_counts=(1, 4, 8, 16), batch_sizes=(5, 20)):
+    server, url = start_mock_ollama(latency=latency)
+    analyzer = GameAnalyzer(backend=OllamaBackend(url=url))
+
+    baseline = None
+    try:
+        for workers in worker_counts:
+            analyzer.extract_game_titles(make_posts(n_posts), max_workers=workers)
+            rate = analyzer.stats['posts_per_sec']
+            baseline = baseline or rate
+            print(f"workers={workers:3d}  {rate:8.1f} posts/sec  "
+                  f"speedup x{rate / baseline:.1f}")
+
+        for batch_size in batch_sizes:
+            analyzer.extract_game_titles(
+                make_posts(n_posts), max_workers=1, batch_size=batch_size)
+            rate = analyzer.stats['posts_per_sec']
+            print(f"batch_size={batch_size:3d}  {rate:8.1f} posts/sec  "
+                  f"{analyzer.stats['llm_requests']} requests  "
+                  f"speedup x{rate / baseline:.1f}")
+    finally:
+        server.shutdown()
+
+
+def grabbag_tiers(path='workfiles/grabbag.json'):
+    """Share of real sample posts each tier resolves"""
+    with open(path, 'r', encoding='utf-8') as f:
+        records = [PostRecord.from_post(post).to_dict() for post in json.load(f)['posts']]
+    # The mock answers no game, so only fast path titles show up
+    analyzer = GameAnalyzer(fast_path=GameAnalyzerText(), backend=MockBackend("None;;"))
+    df = analyzer.extract_game_titles(pd.DataFrame(records))
+    titles = [title for title in df['game_title'] if title and title != 'None']
+    print(f"grabbag.json tiers: {analyzer.stats['tiers']}, fast path titles: {titles}")
+
+
+if __name__ == "__main__":
+    run()
+    grabbag_tiers()
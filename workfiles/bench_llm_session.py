@@ -0,0 +1,41 @@
+# Run from the repo root: python -m workfiles.bench_llm_session
+import time
+
+import requests
+
+from game_analyzer import GameAnalyzer
+from llm_backends import OllamaBackend
+from workfiles.bench_llm_extraction import make_posts
+from workfiles.mock_ollama_server import start_mock_ollama
+
+
+def per_request(post, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        post()
+    return (time.perf_counter() - start) / n
+
+
+def run(n_requests=500, latency=0.0):
+    # With a zero-latency mock every millisecond measured is client and
+    # connection overhead
+    server, url = start_mock_ollama(latency=latency)
+    analyzer = GameAnalyzer(backend=OllamaBackend(url=url))
+    payload = {"model": analyzer.model_name, "prompt": "Fable II", "stream": False}
+
+    try:
+        fresh = per_request(lambda: requests.post(url, json=payload), n_requests)
+        pooled = per_request(
+            lambda: analyzer._generate("Fable II", 0.3), n_requests)
+        print(f"requests.post   {fresh * 1000:6.2f} ms/request (new connection each)")
+        print(f"pooled session  {pooled * 1000:6.2f} ms/request  x{fresh / pooled:.1f}")
+
+        # 8 threads share the pool without opening a connection per post
+        analyzer.extract_game_titles(make_posts(200), max_workers=8)
+    finally:
+        analyzer.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,44 @@
+# Run from the repo root: python -m workfiles.bench_llm_streaming
+from game_analyzer import GameAnalyzer
+from llm_backends import OllamaBackend
+from workfiles.bench_llm_extraction import make_posts
+from workfiles.mock_ollama_server import start_mock_ollama
+
+# A chatty model: the answer line, then an explanation nobody reads
+RAMBLE = ("\nFable II is an action role-playing game released for the Xbox 360. "
+          "It is the sequel to Fable and was followed by Fable III. The post "
+          "mentions it as one of the games that influenced the author, so it "
+          "is listed here with its release year and developer.") * 3
+# ...and one that introduces it first; its ramble ends at the "\n\n" stop
+PREAMBLE = "Sure, here is the game in the requested format:\n"
+
+
+def run(n_posts=100, latency=0.02, token_latency=0.002, workers=4, preamble=""):
+    server, url = start_mock_ollama(
+        latency=latency, token_latency=token_latency,
+        ramble="\n" + RAMBLE if preamble else RAMBLE, preamble=preamble)
+    modes = {
+        'full answer': dict(num_predict=None, stop=()),
+        'num_predict+stop': dict(),
+        'streaming': dict(stream=True),
+    }
+    try:
+        for name, kwargs in modes.items():
+            analyzer = GameAnalyzer(backend=OllamaBackend(url=url), **kwargs)
+            server_tokens = server.tokens_generated
+            df = analyzer.extract_game_titles(make_posts(n_posts), max_workers=workers)
+            stats = analyzer.stats
+            clean = ((df['game_title'] == 'Fable II')
+                     & (df['developer'] == 'Lionhead Studios')).mean()
+            print(f"{'preamble, ' if preamble else ''}{name:18s} {stats['seconds_per_request'] * 1000:6.1f} ms/post  "
+                  f"{stats['tokens_per_request']:5.1f} tokens read  "
+                  f"{(server.tokens_generated - server_tokens) / n_posts:5.1f} generated  "
+                  f"{clean:.0%} clean answers")
+            analyzer.close()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    run()
+    run(preamble=PREAMBLE)
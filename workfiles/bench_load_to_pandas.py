@@ -0,0 +1,81 @@
+# Run from the repo root: python -m workfiles.bench_load_to_pandas
+import json
+import os
+import random
+import tempfile
+import time
+
+import pandas as pd
+
+from data_manager import DataManager
+
+DAYS = 365
+POSTS_PER_DAY = 400
+WORDS = ("day", "game", "challenge", "favorite", "played", "childhood", "best",
+         "zelda", "mario", "souls", "final", "fantasy", "metroid", "portal")
+
+
+def synthetic_post(day, i):
+    text = ' '.join(random.choices(WORDS, k=random.randint(5, 40)))
+    return {
+        'uri': f"at://did:plc:{day:03d}{i:05d}/app.bsky.feed.post/{i}",
+        'handle': f"user{random.randint(0, 5000)}.bsky.social",
+        'created_at': f"2024-{day % 12 + 1:02d}-{day % 28 + 1:02d}T12:00:00.000Z",
+        'text': f"#GameChallenge {text}",
+        'tags': ['GameChallenge'],
+        'like_count': random.randint(0, 50),
+        'image_alts': [text[:30]] if i % 4 == 0 else []
+    }
+
+
+def write_dataset(base_path):
+    for day in range(DAYS):
+        posts = [synthetic_post(day, i) for i in range(POSTS_PER_DAY)]
+        with open(f"{base_path}/posts_gamechallenge_{day:03d}.json", 'w') as f:
+            json.dump({'posts': posts}, f, indent=4)
+
+
+def legacy_load(base_path, pattern):
+    """Serial pd.read_json + json_normalize loader load_to_pandas replaced"""
+    import glob
+    dfs = []
+    for file in glob.glob(f"{base_path}/{pattern}"):
+        df = pd.read_json(file)
+        if 'posts' in df.columns:
+            df = pd.json_normalize(df['posts'])
+        df['source_file'] = os.path.basename(file)
+        dfs.append(df)
+    return pd.concat(dfs, ignore_index=True)
+
+
+def main():
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as base_path:
+        write_dataset(base_path)
+        pattern = 'posts_gamechallenge_*.json'
+        dm = DataManager(base_path)
+
+        start = time.perf_counter()
+        expected = legacy_load(base_path, pattern)
+        legacy_seconds = time.perf_counter() - start
+        print(f"legacy serial loader: {legacy_seconds:.2f}s, {len(expected)} rows")
+
+        # Past the core count, extra workers only show the pool's overhead
+        cores = os.cpu_count() or 1
+        serial = None
+        for workers in sorted({1, 2, 4, cores}):
+            start = time.perf_counter()
+            df = dm.load_to_pandas(pattern, max_workers=workers)
+            seconds = time.perf_counter() - start
+            serial = serial or seconds
+            assert len(df) == len(expected)
+            assert set(df['uri']) == set(expected['uri'])
+            # Columns come out in file order, not hash order
+            assert list(df.columns) == list(synthetic_post(0, 0)) + ['source_file']
+            print(f"{workers:2d} workers ({cores} cores): {seconds:.2f}s "
+                  f"({legacy_seconds / seconds:.1f}x legacy, "
+                  f"{serial / seconds:.1f}x 1 worker)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# Run from the repo root: python -m workfiles.bench_parallel_analysis
+import json
+import os
+import random
+import tempfile
+import time
+
+from game_analyzer_text import GameAnalyzerText
+from parallel_analysis import ParallelTextAnalysis
+
+DAYS = 365
+POSTS_PER_DAY = 200
+TITLES = ("Fable II", "Super Mario Bros. 3", "The Legend of Zelda: Ocarina of Time",
+          "Half-Life 2", "Portal", "Dark Souls", "Final Fantasy VII", "Tetris")
+
+
+def write_dataset(base_path):
+    random.seed(0)
+    for day in range(DAYS):
+        posts = [{
+            'uri': f"at://did:plc:bench/app.bsky.feed.post/{day:03d}{i:05d}",
+            'text': (f"Day {i % 20 + 1:02d}: {random.choice(TITLES)}\n\n#GameChallenge"
+                     if i % 5 else "Loving this challenge, no idea what to pick today")
+        } for i in range(POSTS_PER_DAY)]
+        with open(f"{base_path}/posts_gamechallenge_{day:03d}.json", 'w') as f:
+            json.dump({'posts': posts}, f)
+
+
+def main():
+    # Built before changing directory: it loads TextDump_GameOnly.txt
+    analyzer = GameAnalyzerText()
+    analyzer.title_matcher  # build once, outside the timings
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as base_path:
+        write_dataset(base_path)
+        os.chdir(base_path)  # unmatched_posts.txt goes here
+        try:
+            start = time.perf_counter()
+            serial = {'total_processed': 0}
+            expected = None
+            for day in range(DAYS):
+                counts = analyzer.count_posts(
+                    (post['text'], post['uri']) for post in json.load(
+                        open(f"posts_gamechallenge_{day:03d}.json"))['posts'])
+                if expected is None:
+                    expected = counts['game_counts']
+                else:
+                    expected.update(counts['game_counts'])
+                serial['total_processed'] += counts['total_processed']
+            serial_seconds = time.perf_counter() - start
+            print(f"serial: {serial_seconds:.2f}s, {serial['total_processed']} posts")
+
+            workers = 1
+            while workers <= (os.cpu_count() or 1):
+                driver = ParallelTextAnalysis(
+                    analyzer, max_workers=workers, base_path=base_path)
+                start = time.perf_counter()
+                result = driver.analyze_files('posts_gamechallenge_*.json')
+                seconds = time.perf_counter() - start
+                assert result == dict(expected.most_common())
+                print(f"{workers:2d} workers: {seconds:.2f}s "
+                      f"({serial_seconds / seconds:.1f}x serial)")
+                workers *= 2
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# Run from the repo root: python -m workfiles.bench_parquet_dataset
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from data_manager import DataManager
+from parquet_dataset import ParquetDataset
+
+POSTS_PER_DAY = 400
+WORDS = ("day", "game", "challenge", "favorite", "played", "childhood", "best",
+         "zelda", "mario", "souls", "final", "fantasy", "metroid", "portal")
+
+
+def synthetic_post(day, i):
+    text = ' '.join(random.choices(WORDS, k=random.randint(5, 40)))
+    return {
+        'uri': f"at://did:plc:{day.toordinal()}{i:05d}/app.bsky.feed.post/{i}",
+        # Deleted accounts come back without a handle
+        'handle': f"user{random.randint(0, 5000)}.bsky.social" if i % 50 else None,
+        'created_at': f"{day.isoformat()}T{i % 24:02d}:00:00.000Z",
+        'text': f"#GameChallenge {text}",
+        'tags': ['GameChallenge'],
+        'like_count': random.randint(0, 50),
+        'image_alts': [text[:30]] if i % 4 == 0 else []
+    }
+
+
+def write_year(base_path, dataset, first_day=date(2024, 1, 1)):
+    """One JSON file per day for load_to_pandas, and the same posts as Parquet"""
+    for offset in range(366):
+        day = first_day + timedelta(days=offset)
+        posts = [synthetic_post(day, i) for i in range(POSTS_PER_DAY)]
+        with open(f"{base_path}/posts_gamechallenge_{day:%Y%m%d}.json", 'w') as f:
+            json.dump({'posts': posts}, f, indent=4)
+        dataset.write(pd.DataFrame(posts), 'GameChallenge')
+
+
+def timed(label, load):
+    start = time.perf_counter()
+    df = load()
+    print(f"{label}: {time.perf_counter() - start:.2f}s, {len(df)} rows")
+    return df
+
+
+def main():
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as base_path:
+        dataset = ParquetDataset(os.path.join(base_path, 'parquet'))
+        write_year(base_path, dataset)
+        dm = DataManager(base_path)
+        december = dict(start='2024-12-01', end='2024-12-31', min_likes=10)
+
+        def json_december():
+            df = dm.load_to_pandas('posts_gamechallenge_*.json')
+            created_at = pd.to_datetime(df['created_at'], utc=True, format='ISO8601')
+            return df[(created_at.dt.strftime('%Y-%m') == '2024-12') & (df['like_count'] > 10)]
+
+        year = timed("JSON year, load_to_pandas", lambda: dm.load_to_pandas(
+            'posts_gamechallenge_*.json'))
+        timed("Parquet year, query()", dataset.query)
+        expected = timed("JSON December likes > 10, load then filter", json_december)
+        df = timed("Parquet December likes > 10, query()", lambda: dataset.query(**december))
+        timed("Parquet December likes > 10, two columns", lambda: dataset.query(
+            columns=['uri', 'like_count'], **december))
+
+        assert set(df['uri']) == set(expected['uri'])
+        # Missing handles read back as nulls, not the string 'None'
+        assert df['handle'].isna().sum() == expected['handle'].isna().sum() > 0
+        handles = dataset.query(columns=['handle'])['handle']
+        assert handles.isna().sum() == year['handle'].isna().sum()
+        assert not (handles == 'None').any()
+        print(f"{handles.isna().sum()} missing handles stored as null")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+# Run from the repo root: python -m workfiles.bench_pipeline
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from bsky_fetcher import AsyncBskyFetcher
+from crawl_state import CrawlStateStore
+from game_analyzer_text import GameAnalyzerText
+from pipeline import StreamingPipeline
+from rate_limiter import TokenBucket
+from workfiles.mock_xrpc_server import start_mock_xrpc
+
+
+def run(day_counts=(7, 30, 90, 180), posts_per_window=250):
+    server, base_url = start_mock_xrpc(
+        posts_per_window=posts_per_window, latency=0.02, rate_limit_every=0)
+    analyzer = GameAnalyzerText()
+    analyzer.title_matcher  # built once, outside the timings
+    analyzer.known_games.get('')  # as is the index's lookup table
+    state_dir = tempfile.mkdtemp()
+    try:
+        for days in day_counts:
+            fetcher = AsyncBskyFetcher(
+                base_url=base_url, max_concurrency=8, rate_limiter=TokenBucket(rate=200))
+            pipeline = StreamingPipeline(analyzer, emit_interval=1.0)
+            windows = AsyncBskyFetcher.day_windows(datetime(2024, 1, 1), days)
+            # Checkpointed like stream_game_counts.py; the crawl thread writes it
+            state = CrawlStateStore(os.path.join(state_dir, f"state_{days}.sqlite"))
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            first = None
+            for snapshot in pipeline.run(
+                    pipeline.fetch_pages(fetcher, "gamechallenge", windows, state=state)):
+                first = first or time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            state.close()
+
+            print(f"{days:3d} days, {snapshot['posts']:6d} posts: first result after "
+                  f"{first:.2f}s, done in {snapshot['seconds']:.1f}s, "
+                  f"peak traced memory {peak / 2 ** 20:.1f} MB")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,122 @@
+# Run from the repo root: python -m workfiles.bench_post_record
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from data_manager import DataManager
+from post_record import PostRecord, parse_search_page
+from workfiles.mock_xrpc_server import make_post
+
+PAGES = 400  # 40k posts, a busy day
+PAGE_SIZE = 100
+
+
+def full_post(day, i):
+    """make_post plus the parts of a real PostView the saved fields ignore"""
+    post = make_post(day, i)
+    post['author'].update({
+        'displayName': f"User {i % 50}",
+        'avatar': f"https://cdn.bsky.app/img/avatar/plain/did:plc:mock{i % 50}/{'b' * 60}@jpeg",
+        'viewer': {'muted': False, 'blockedBy': False},
+        'labels': [],
+        'createdAt': f"{day}T00:00:00.000Z"
+    })
+    post['embed'] = {
+        '$type': 'app.bsky.embed.recordWithMedia#view',
+        'media': {'$type': 'app.bsky.embed.images#view', 'images': [{
+            'thumb': f"https://cdn.bsky.app/img/feed_thumbnail/plain/{'c' * 80}@jpeg",
+            'fullsize': f"https://cdn.bsky.app/img/feed_fullsize/plain/{'c' * 80}@jpeg",
+            'alt': f"Box art of game {i}",
+            'aspectRatio': {'width': 1200, 'height': 1600}
+        }]},
+        'record': {'record': {'uri': f"at://did:plc:quoted/app.bsky.feed.post/{i}",
+                              'author': dict(post['author']),
+                              'value': dict(post['record']),
+                              'indexedAt': post['indexedAt']}}
+    }
+    post.update({'replyCount': 1, 'repostCount': 2, 'quoteCount': 0,
+                 'viewer': {'threadMuted': False, 'embeddingDisabled': False},
+                 'labels': []})
+    return post
+
+
+def legacy_simplify(post):
+    """Field selection DataManager.simplify_post_dict used to do"""
+    record = post.get('record', {})
+    tags = []
+    for facet in record.get('facets') or []:
+        for feature in facet.get('features', []):
+            if 'tag' in feature:
+                tags.append(feature['tag'])
+
+    image_alts = []
+    media = (post.get('embed') or {}).get('media') or {}
+    if 'images' in media:
+        image_alts = [img.get('alt', '') for img in media['images']]
+
+    return {
+        'uri': post['uri'],
+        'handle': post['author']['handle'],
+        'created_at': record.get('createdAt'),
+        'text': record.get('text', ''),
+        'tags': tags,
+        'like_count': post.get('likeCount', 0),
+        'image_alts': image_alts
+    }
+
+
+def captured_pages():
+    return [json.dumps({'posts': [full_post('2024-12-01', page * PAGE_SIZE + i)
+                                  for i in range(PAGE_SIZE)],
+                        'cursor': str(page)}).encode()
+            for page in range(PAGES)]
+
+
+def run_mode(mode):
+    pages = captured_pages()
+    kept = []  # what stays in memory until the day is written
+    start = time.process_time()
+    if mode == 'models':
+        from atproto import models
+        for content in pages:
+            response = models.AppBskyFeedSearchPosts.Response(**json.loads(content))
+            kept.extend(response.posts)
+        saved = [DataManager.simplify_post(post) for post in kept]
+    elif mode == 'dicts':
+        for content in pages:
+            kept.extend(json.loads(content)['posts'])
+        saved = [PostRecord.from_post(post).to_dict() for post in kept]
+    else:
+        for content in pages:
+            kept.extend(parse_search_page(content)[0])
+        saved = [record.to_dict() for record in kept]
+    seconds = time.process_time() - start
+    posts = len(saved)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:8s} {seconds / posts * 1e6:7.1f} us/post CPU  peak RSS {peak_mb:6.0f} MB")
+    return saved
+
+
+def main():
+    # Every mode runs in its own process so peak RSS is not shared
+    for mode in ('models', 'dicts', 'records'):
+        result = subprocess.run(
+            [sys.executable, '-m', 'workfiles.bench_post_record', mode],
+            capture_output=True, text=True)
+        print(result.stdout.strip() or f"{mode:8s} skipped: {result.stderr.strip().splitlines()[-1]}")
+
+    pages = captured_pages()[:2]
+    expected = [legacy_simplify(post)
+                for content in pages for post in json.loads(content)['posts']]
+    records = [record.to_dict() for content in pages for record in parse_search_page(content)[0]]
+    assert records == expected
+    print("records match the legacy field selection")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        run_mode(sys.argv[1])
+    else:
+        main()
@@ -0,0 +1,56 @@
+# Run from the repo root: python -m workfiles.bench_post_table
+import random
+import time
+
+import pandas as pd
+
+from post_table import PostTable
+
+WORDS = ("day", "game", "challenge", "favorite", "played", "childhood", "best",
+         "zelda", "mario", "souls", "final", "fantasy", "metroid", "portal")
+
+
+def synthetic_posts(n):
+    random.seed(0)
+    for i in range(n):
+        text = ' '.join(random.choices(WORDS, k=random.randint(5, 40)))
+        yield {
+            'uri': f"at://did:plc:{i % 20000:08d}/app.bsky.feed.post/3k{i:011d}",
+            'handle': f"user{i % 20000}.bsky.social",
+            'created_at': f"2024-12-{i % 28 + 1:02d}T12:{i % 60:02d}:00.000Z",
+            'text': f"Day {i % 20 + 1:02d}: {text}\n\n#GameChallenge",
+            'tags': ['GameChallenge', 'retrogaming'] if i % 3 else ['GameChallenge'],
+            'like_count': random.randint(0, 50),
+            'image_alts': [f"Box art {i}"] if i % 4 == 0 else []
+        }
+
+
+def main(n=500000):
+    start = time.perf_counter()
+    df = pd.DataFrame.from_records(synthetic_posts(n))
+    df_bytes = df.memory_usage(deep=True).sum()
+    print(f"DataFrame: {df_bytes / n:6.0f} bytes/post "
+          f"({df_bytes / 2 ** 20:.0f} MB, built in {time.perf_counter() - start:.1f}s)")
+
+    # pandas < 3 keeps every string as a Python object
+    object_bytes = df.astype(object).memory_usage(deep=True).sum()
+    print(f"DataFrame, object dtype: {object_bytes / n:6.0f} bytes/post "
+          f"({object_bytes / 2 ** 20:.0f} MB)")
+
+    start = time.perf_counter()
+    table = PostTable.from_posts(synthetic_posts(n))
+    table_bytes = table.nbytes()
+    print(f"PostTable: {table_bytes / n:6.0f} bytes/post "
+          f"({table_bytes / 2 ** 20:.0f} MB, built in {time.perf_counter() - start:.1f}s, "
+          f"{df_bytes / table_bytes:.1f}x / {object_bytes / table_bytes:.1f}x smaller)")
+
+    start = time.perf_counter()
+    chars = sum(len(text) for text in table.iter_column('text'))
+    print(f"Decoding every text from the table: {time.perf_counter() - start:.2f}s "
+          f"({chars} chars)")
+    assert table.row(12345) == next(
+        post for i, post in enumerate(synthetic_posts(12346)) if i == 12345)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# Run from the repo root: python -m workfiles.bench_text_cleaner
+import glob
+import random
+import re
+import time
+
+import pandas as pd
+
+from data_manager import DataManager
+from text_cleaner import TextCleaner
+
+MASK_PHRASES = TextCleaner.MASK_PHRASES
+
+
+def legacy_clean_for_llm(text):
+    """GameAnalyzer.clean_text before TextCleaner"""
+    return re.sub(r'http\S+|[@#]\w+|[^\w\s]', '', text.lower())
+
+
+def legacy_clean_for_matching(text):
+    """GameAnalyzerText.clean_text before TextCleaner"""
+    for phrase in MASK_PHRASES:
+        text = text.replace(phrase, '')
+    text = re.sub(r'[^\w\s:,]', '', text)
+    return text.lower().strip()
+
+
+def mask_any_case(text):
+    """Boilerplate removal as TextCleaner does it, ignoring case"""
+    for phrase in MASK_PHRASES:
+        text = re.sub(re.escape(phrase), '', text, flags=re.IGNORECASE)
+    return text
+
+
+def fuzz_texts(n):
+    """Random mixes of the characters and pieces the cleaners treat specially"""
+    pieces = list("aZ09_ :,.!?#@-'\"()\t\n\r\x0b\x0c\x1c\x1f\x85\xa0") + [
+        "é", "ß", "İ", "Ω", "ǅ", "½", "²", "٣", "中", "́", "‍", "🎮", "❤️",
+        "http", "https://bsky.app/x", "#GameChallenge", "@user.bsky.social",
+        "Day 05: ", "Fable II", *MASK_PHRASES, MASK_PHRASES[0][:12],
+        MASK_PHRASES[1].lower(), MASK_PHRASES[2].upper()]
+    return [''.join(random.choices(pieces, k=random.randint(0, 30))) for _ in range(n)]
+
+
+def realistic_texts(n):
+    texts = []
+    for i in range(n):
+        text = (f"Day {i % 20 + 1:02d}: Fable II\n\n{random.choice(MASK_PHRASES)} "
+                f"#GameChallenge @friend{i % 9}.bsky.social https://example.com/{i}")
+        if i % 3 == 0:
+            text += " 🎮✨ Très bien!"
+        texts.append(text)
+    return texts
+
+
+def captured_texts():
+    """Texts of any crawled posts in ./data"""
+    texts = []
+    for path in glob.glob('./data/posts_*.json*'):
+        texts.extend(post.get('text', '') for post in DataManager.read_posts(path))
+    return texts
+
+
+def check_parity(cleaner, texts):
+    series = pd.Series(texts)
+    assert [cleaner.clean_for_llm(t) for t in texts] == [legacy_clean_for_llm(t) for t in texts]
+    assert [cleaner.clean_for_matching(t) for t in texts] == \
+        [legacy_clean_for_matching(mask_any_case(t)) for t in texts]
+    assert cleaner.clean_for_llm_series(series).tolist() == \
+        [legacy_clean_for_llm(t) for t in texts]
+    assert cleaner.clean_for_matching_series(series).tolist() == \
+        [legacy_clean_for_matching(mask_any_case(t)) for t in texts]
+
+
+def timed(label, func, n):
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    print(f"  {label:34s} {seconds / n * 1e6:6.2f} us/post")
+    return seconds
+
+
+def main(n=100000):
+    random.seed(0)
+    cleaner = TextCleaner()
+    captured = captured_texts()
+    check_parity(cleaner, fuzz_texts(50000) + captured)
+    print(f"Parity OK on 50000 fuzzed and {len(captured)} captured posts")
+
+    texts = realistic_texts(n)
+    check_parity(cleaner, texts)
+    series = pd.Series(texts)
+    print(f"{n} posts:")
+    for name, legacy, single, column in (
+            ('llm', legacy_clean_for_llm, cleaner.clean_for_llm,
+             cleaner.clean_for_llm_series),
+            ('matching', legacy_clean_for_matching, cleaner.clean_for_matching,
+             cleaner.clean_for_matching_series)):
+        base = timed(f"{name}: legacy via Series.apply", lambda: series.apply(legacy), n)
+        one = timed(f"{name}: TextCleaner per post", lambda: [single(t) for t in texts], n)
+        whole = timed(f"{name}: TextCleaner on the Series", lambda: column(series), n)
+        print(f"  speedup x{base / one:.1f} per post, x{base / whole:.1f} whole column")
+
+
+if __name__ == '__main__':
+    main()
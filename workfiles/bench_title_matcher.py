@@ -0,0 +1,93 @@
+# Run from the repo root: python -m workfiles.bench_title_matcher
+import json
+import random
+import time
+
+from game_analyzer_text import GameAnalyzerText
+
+# Everyday sentences that name no game; many of their phrases are titles
+# somewhere in TextDump_GameOnly.txt
+TITLE_FREE = [
+    "I was up all night finishing the last boss",
+    "after school we used to swap cartridges at my friend's house",
+    "today i finally cleaned out my backlog",
+    "The challenge is to choose 20 games that greatly influenced you.",
+    "the challenge is harder than it looks, so many good ones",
+    "Honestly this one changed how I think about level design",
+    "Played it every summer with my brother, good times",
+    "No explanations, no reviews, no particular order.",
+    "Still can't believe how long I spent on this back in the day",
+    "Not sure what to pick for tomorrow, any ideas?",
+    "this was my first RPG and I never looked back",
+    "It came free with the console and I played it to death",
+    "My dad bought it for me on a rainy day at the mall",
+    "one more day to go, then I start over again",
+    "Big thanks to everyone sharing their lists, love reading them",
+    "we stayed up late every night trying to beat it together",
+    "Home alone with a new controller and no homework",
+    "This one is for all the night owls out there",
+    "Back to the start: the game that got me into gaming",
+    "what a time to be alive, honestly",
+]
+
+
+def make_posts(analyzer, n, seed=0):
+    rng = random.Random(seed)
+    titles = [t for t in analyzer.known_games.values() if ' ' in t]
+    templates = [
+        "Choose 20 games that greatly influenced you.\n\nDay {day:02d}: {title}\n\n#GameChallenge",
+        "Day {day}: {title}, {other}\n#GameChallenge #retrogames",
+        "Still think {title} holds up. Played it again after {other} #GameChallenge",
+    ]
+    return [
+        rng.choice(templates).format(
+            day=rng.randint(1, 20), title=rng.choice(titles),
+            other=rng.choice(titles))
+        for _ in range(n)
+    ]
+
+
+def timed(label, func, posts):
+    start = time.perf_counter()
+    found = sum(1 for post in posts if func(post))
+    elapsed = time.perf_counter() - start
+    print(f"{label:22s} {len(posts) / elapsed:10.0f} posts/sec  "
+          f"{found}/{len(posts)} posts matched")
+
+
+def run(n_posts=20000):
+    analyzer = GameAnalyzerText()
+    posts = make_posts(analyzer, n_posts)
+
+    start = time.perf_counter()
+    analyzer.title_matcher
+    print(f"Automaton built in {time.perf_counter() - start:.2f}s "
+          f"({len(analyzer.title_matcher)} titles)")
+
+    timed("split-and-lookup",
+          lambda post: analyzer.match_fragments(analyzer.clean_text(post)), posts)
+    timed("automaton", analyzer.extract_game_titles, posts)
+    check_precision(analyzer)
+
+
+def check_precision(analyzer):
+    """Titles found in real sample posts and in posts that name no game"""
+    with open('workfiles/grabbag.json', 'r', encoding='utf-8') as f:
+        real = [post['record']['text'] for post in json.load(f)['posts']]
+    for text in real:
+        day_line = next((line for line in text.splitlines()
+                         if line.lower().startswith('day')), '')
+        print(f"  {day_line[:30]!r:34s} -> {analyzer.match_titles(text)}")
+
+    unfiltered = [analyzer.title_matcher.find_all(text) for text in TITLE_FREE]
+    vetted = [analyzer.match_titles(text) for text in TITLE_FREE]
+    print(f"Title-free posts with matches: "
+          f"{sum(map(bool, unfiltered))}/{len(TITLE_FREE)} unvetted automaton, "
+          f"{sum(map(bool, vetted))}/{len(TITLE_FREE)} match_titles")
+    for text, titles in zip(TITLE_FREE, vetted):
+        if titles:
+            print(f"  false positive: {text!r} -> {titles}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,128 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Stand-in for a local Ollama server: answers /api/generate after a fixed
+# delay so extraction throughput can be measured without a model loaded.
+# /v1/chat/completions answers like a llama.cpp or vLLM server.
+class MockOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep connections open, like Ollama
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    latency = 0.2  # before the first token
+    token_latency = 0.0  # per generated token
+    answer = "Fable II;2008;Lionhead Studios"
+    ramble = ""  # what a chatty model keeps generating after the answer
+    preamble = ""  # what it says before the answer
+
+    def generate(self, request):
+        """Tokens the model would produce, honouring num_predict and stop"""
+        # Packed prompts number their posts as [1], [2], ...
+        slots = re.findall(r'^\[(\d+)\]$', request.get('prompt', ''), re.MULTILINE)
+        if slots:
+            answer = '\n'.join(f"{slot}. {self.answer}" for slot in slots)
+        else:
+            answer = self.answer
+        tokens = re.findall(r'\n|[^\S\n]*\S+', self.preamble + answer + self.ramble)
+
+        options = request.get('options') or {}
+        tokens = tokens[:options.get('num_predict') or len(tokens)]
+        text = ''
+        for i, token in enumerate(tokens):
+            text += token
+            stops = [text.find(stop) for stop in options.get('stop') or () if stop in text]
+            if stops:
+                # Like Ollama, the stop sequence itself is not returned
+                kept = tokens[:i] + [token]
+                while sum(map(len, kept)) > min(stops):
+                    excess = sum(map(len, kept)) - min(stops)
+                    last = kept.pop()
+                    if len(last) > excess:
+                        kept.append(last[:-excess])
+                return kept
+        return tokens
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        openai = self.path.startswith('/v1/')
+        if openai:
+            # OpenAI-style chat completion, as served by llama.cpp or vLLM
+            request['prompt'] = request['messages'][-1]['content']
+            request['options'] = {'num_predict': request.get('max_tokens'),
+                                  'stop': request.get('stop')}
+        tokens = self.generate(request)
+        time.sleep(self.latency)
+
+        self.send_response(200)
+        if request.get('stream'):
+            self.send_header('Content-Type', 'text/event-stream' if openai
+                             else 'application/x-ndjson')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            try:
+                for token in tokens:
+                    time.sleep(self.token_latency)
+                    self.server.tokens_generated += 1
+                    if openai:
+                        self.write_chunk(b'data: ' + json.dumps(
+                            {'choices': [{'delta': {'content': token}}]}).encode() + b'\n\n')
+                    else:
+                        self.write_chunk(json.dumps(
+                            {'response': token, 'done': False}).encode() + b'\n')
+                if openai:
+                    self.write_chunk(b'data: [DONE]\n\n')
+                else:
+                    self.write_chunk(json.dumps(
+                        {'response': '', 'done': True, 'eval_count': len(tokens)}).encode() + b'\n')
+                self.wfile.write(b'0\r\n\r\n')
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True  # client cancelled the generation
+            return
+
+        time.sleep(self.token_latency * len(tokens))
+        self.server.tokens_generated += len(tokens)
+        if openai:
+            result = {'choices': [{'message': {'role': 'assistant', 'content': ''.join(tokens)}}],
+                      'usage': {'completion_tokens': len(tokens)}}
+        else:
+            result = {'response': ''.join(tokens), 'done': True, 'eval_count': len(tokens)}
+        body = json.dumps(result).encode()
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b'\r\n')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_ollama(port=0, latency=0.2, token_latency=0.0, ramble="", preamble=""):
+    """Start the mock server in a thread, return (server, api_url)
+
+    server.tokens_generated counts the tokens produced so far, including
+    those of streams the client cancelled.
+    """
+    handler = type('Handler', (MockOllamaHandler,), {
+        'latency': latency, 'token_latency': token_latency, 'ramble': ramble,
+        'preamble': preamble})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.tokens_generated = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/generate"
+    return server, url
+
+
+if __name__ == "__main__":
+    server, url = start_mock_ollama(port=11434)
+    print(f"Mock Ollama listening on {url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+# Local stand-in for the Bluesky XRPC API: searchPosts returns a fixed
+# number of synthetic posts per since/until window, paged with offset
+# cursors, and every rate_limit_every-th request is answered with 429.
+class MockXrpcHandler(BaseHTTPRequestHandler):
+    posts_per_window = 250
+    latency = 0.05
+    rate_limit_every = 7
+    requests_seen = 0
+    request_times = []
+    lock = threading.Lock()
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.startswith('/xrpc/com.atproto.server.createSession'):
+            self._send_json(200, {'accessJwt': 'mock-access', 'refreshJwt': 'mock-refresh',
+                                  'handle': 'mock.bsky.social', 'did': 'did:plc:mock'})
+        else:
+            self._send_json(404, {'error': 'NotFound'})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != '/xrpc/app.bsky.feed.searchPosts':
+            self._send_json(404, {'error': 'NotFound'})
+            return
+
+        cls = type(self)
+        with cls.lock:
+            cls.requests_seen += 1
+            cls.request_times.append(time.monotonic())
+            seen = cls.requests_seen
+        time.sleep(self.latency)
+
+        if self.rate_limit_every and seen % self.rate_limit_every == 0:
+            self._send_json(429, {'error': 'RateLimitExceeded'}, {
+                'Retry-After': '0.1',
+                'RateLimit-Limit': '3000',
+                'RateLimit-Remaining': '0',
+                'RateLimit-Reset': str(int(time.time()) + 1)
+            })
+            return
+
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        offset = int(params.get('cursor', 0))
+        limit = int(params.get('limit', 25))
+        day = params.get('since', '')[:10]
+        end = min(offset + limit, self.posts_per_window)
+        posts = [make_post(day, i) for i in range(offset, end)]
+
+        page = {'posts': posts, 'hitsTotal': self.posts_per_window}
+        if end < self.posts_per_window:
+            page['cursor'] = str(end)
+        self._send_json(200, page, {
+            'RateLimit-Limit': '3000',
+            'RateLimit-Remaining': str(3000 - seen),
+            'RateLimit-Reset': str(int(time.time()) + 300)
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_post(day, i):
+    rkey = f"{day.replace('-', '')}{i:06d}"
+    return {
+        'uri': f"at://did:plc:mock{i % 50}/app.bsky.feed.post/{rkey}",
+        'cid': f"bafymock{rkey}",
+        'author': {'did': f"did:plc:mock{i % 50}", 'handle': f"user{i % 50}.bsky.social"},
+        'record': {
+            '$type': 'app.bsky.feed.post',
+            'createdAt': f"{day}T12:00:00.000Z",
+            'text': f"Day {i % 20 + 1:02d}: Fable II\n\n#GameChallenge",
+            'facets': [{'features': [{'$type': 'app.bsky.richtext.facet#tag',
+                                      'tag': 'GameChallenge'}]}]
+        },
+        'likeCount': i % 13,
+        'indexedAt': f"{day}T12:00:01.000Z"
+    }
+
+
+def start_mock_xrpc(port=0, **settings):
+    """Start the mock server in a thread, return (server, base_url)"""
+    handler = type('Handler', (MockXrpcHandler,), dict(
+        settings, requests_seen=0, request_times=[], lock=threading.Lock()))
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.handler = handler
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    server, url = start_mock_xrpc(port=8080)
+    print(f"Mock XRPC server listening on {url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()